@@ -0,0 +1,61 @@
+"""
+Import-time check for the spShelf hotkey entry point.
+
+Runs `python -X importtime -c "import spShelf"` against the maya stub in a fresh
+interpreter, reports the time spent importing spShelf itself and verifies that the
+import does no Maya queries, no disk I/O on the user data and no PySide import.
+
+    python benchmarks/bench_import.py --runs 10 --budget-ms 3
+
+The budget applies to spShelf's own module body ("self" time). The cumulative time also
+contains standard library modules (json, re, threading, ...) that a Maya session has
+normally imported long before the first hotkey press.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+STUB_PATH = os.path.join(HERE, "maya_stub")
+REPO_PATH = os.path.dirname(HERE)
+
+CHECK_SCRIPT = """
+import sys
+import maya.cmds
+import spShelf
+assert spShelf._shelf_instance is None, "SpShelf instance created at import"
+assert not maya.cmds.counts, "maya.cmds called at import: %s" % dict(maya.cmds.counts)
+assert not [m for m in sys.modules if m.startswith(("PySide", "shiboken"))], "PySide imported at import"
+"""
+
+def import_time_us(env):
+    # -X importtime writes "import time: self [us] | cumulative | imported package" lines to stderr
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import maya.cmds, maya.mel, maya.utils; import spShelf"],
+                            env=env, capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == "spShelf":
+            return int(parts[0].split(":")[-1]), int(parts[1])
+    raise RuntimeError("spShelf not found in -X importtime output")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=3.0, help="Budget for the self import time of spShelf")
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([STUB_PATH, REPO_PATH]), PYTHONDONTWRITEBYTECODE="")
+    subprocess.run([sys.executable, "-c", CHECK_SCRIPT], env=env, check=True)
+
+    samples = [import_time_us(env) for _ in range(args.runs)]
+    self_us = sorted(s[0] for s in samples)[len(samples) // 2]
+    cumulative_us = sorted(s[1] for s in samples)[len(samples) // 2]
+    print(f"import spShelf (median of {args.runs}): self {self_us / 1000:.2f} ms, cumulative {cumulative_us / 1000:.2f} ms")
+    print("no maya.cmds calls, no SpShelf instance, no PySide import at import time: OK")
+    if self_us / 1000 > args.budget_ms:
+        print(f"over budget ({args.budget_ms} ms)")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
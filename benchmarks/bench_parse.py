@@ -0,0 +1,99 @@
+"""
+Parse benchmark for spShelf's MEL shelf parser.
+
+Generates a synthetic shelf file with the given number of buttons (multi-line and escaped
+commands, menu items with parentheses, separators) and reports parse throughput.
+
+    python benchmarks/bench_parse.py --buttons 10000 --repeat 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(HERE, "maya_stub"), os.path.dirname(HERE)]
+
+import spShelf
+
+BUTTON_TEMPLATE = '''    shelfButton
+        -enableCommandRepeat 1
+        -width 35
+        -height 34
+        -annotation "Tool {i}: says \\"hi\\" (and more)" 
+        -backgroundColor 0 0 0 
+        -highlightColor 0.321569 0.521569 0.65098 
+        -label "Tool {i}" 
+        -imageOverlayLabel "T{i}" 
+        -image "pythonFamily.png" 
+        -image1 "pythonFamily.png" 
+        -style "iconOnly" 
+        -command "import maya.cmds as cmds\\nfor i in range({i}):\\n    print(\\"tool ({i})\\")\\n" 
+        -sourceType "python" 
+        -doubleClickCommand "print({i})" 
+        -commandRepeatable 1
+        -flat 1
+        -mi "Options ({i})" ( "python(\\"print(({i}))\\")" )
+        -mi "Python item" ( "print(\\"item\\")" )
+        -mip 1
+    ;
+'''
+
+SEPARATOR_TEMPLATE = '''    separator
+        -enable 1
+        -width 12
+        -height 35
+        -style "shelf" 
+        -horizontal 0
+    ;
+'''
+
+def make_shelf_text(button_count, separator_every=10):
+    parts = ["global proc shelf_Bench () {\n    global string $gBuffStr;\n"]
+    for i in range(button_count):
+        parts.append(BUTTON_TEMPLATE.format(i=i))
+        if separator_every and i % separator_every == separator_every - 1:
+            parts.append(SEPARATOR_TEMPLATE)
+    parts.append("}\n")
+    return "".join(parts)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--buttons", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = make_shelf_text(args.buttons)
+    separator_count = args.buttons // 10
+    path = os.path.join(tempfile.mkdtemp(), "shelf_Bench.mel")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+    shelf = spShelf.SpShelf.__new__(spShelf.SpShelf)
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        buttons = shelf.parse_shelf_file(path)
+        timings.append(time.perf_counter() - start)
+
+    # Lossless check: every button, separator, menu item and per-item source type survives
+    parsed_buttons = [b for b in buttons if b.get("type") != "separator"]
+    assert len(parsed_buttons) == args.buttons, len(parsed_buttons)
+    assert len(buttons) - len(parsed_buttons) == separator_count
+    sample = parsed_buttons[-1]
+    assert sample["imageOverlayLabel"] == f"T{args.buttons - 1}"
+    # Display strings are unescaped, commands stay raw
+    assert sample["annotation"] == f'Tool {args.buttons - 1}: says "hi" (and more)', sample["annotation"]
+    assert [item["sourceType"] for item in sample["menuItems"]] == ["mel", "python"]
+    assert sample["menuItems"][0]["command"] == f'python(\\"print(({args.buttons - 1}))\\")'
+
+    best = min(timings)
+    size_mb = len(text.encode("utf-8")) / (1024 * 1024)
+    print(f"buttons:     {args.buttons} (+{separator_count} separators)")
+    print(f"file size:   {size_mb:.2f} MB")
+    print(f"best parse:  {best * 1000:.1f} ms")
+    print(f"throughput:  {args.buttons / best:,.0f} buttons/s, {size_mb / best:.1f} MB/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Headless benchmark suite for spShelf.
+
+Runs spShelf against the counting maya.cmds fake in benchmarks/maya_stub on synthetic
+libraries (1, 10 and 50 shelves of 10 to 500 buttons, with separators and menu items) and
+reports, per library:
+
+    parse         parse_shelf_file throughput over all shelf files
+    import        adding every shelf through add_current_shelf / all at once through import_shelves
+    load          cold SpShelf() start, reading the store from disk
+    cold / warm   create_window on a freshly loaded instance (load excluded) / again on the same instance
+    ui objects    UI controls and maya.cmds calls made by one create_window
+    save          save_user_data of all content / of the state only, flushed to disk
+    search        building the quick-search index / slowest of a set of typical queries
+    json          size of the store on disk
+
+Times are the best of --repeat runs. Use --output to keep the results as JSON and
+--compare to print the change against an earlier run. --spshelf benchmarks the spShelf.py
+of another checkout with this suite, metrics whose feature that version lacks are skipped:
+
+    git worktree add /tmp/spShelf_old <commit>
+    python benchmarks/bench_suite.py --spshelf /tmp/spShelf_old --output before.json
+    python benchmarks/bench_suite.py --compare before.json
+"""
+import argparse
+import contextlib
+import importlib
+import inspect
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [HERE, os.path.join(HERE, "maya_stub")]
+
+from maya import cmds
+
+# Imported in main(), from the checkout given with --spshelf
+spShelf = None
+make_shelf_text = None
+
+SHELF_COUNTS = (1, 10, 50)
+BUTTON_COUNTS = (10, 100, 500)
+# Metrics where lower is better, compared by --compare
+TIME_METRICS = ("parse_ms", "import_ms", "bulk_import_ms", "load_ms", "cold_window_ms", "warm_window_ms", "save_all_ms",
+                "save_state_ms", "search_index_ms", "search_ms")
+# Keystroke by keystroke, plus multi-word, shelf name and no-hit queries
+SEARCH_QUERIES = ("t", "to", "too", "tool", "tool 4", "tool 42", "says hi", "more", "bench1", "t4 bench", "zzz")
+
+def best_of(repeat, fn):
+    # Best wall time in ms and the result of that run
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - start) * 1000.0
+        if best is None or elapsed < best[0]:
+            best = (elapsed, result)
+    return best
+
+def ui_totals():
+    return sum(cmds.counts.values()), sum(cmds.created.values()), sum(cmds.seconds.values())
+
+def flush(instance):
+    # Older versions write synchronously and have no pending writes to flush
+    if hasattr(instance, "flush_user_data"):
+        instance.flush_user_data()
+
+def store_size(instance):
+    # Split store (state file + per-shelf content files) or the older single data file
+    paths = [getattr(instance, "user_state_file", None) or getattr(instance, "user_data_file")]
+    content_dir = getattr(instance, "user_content_dir", None)
+    if content_dir and os.path.isdir(content_dir):
+        paths += [os.path.join(content_dir, name) for name in os.listdir(content_dir)]
+    return sum(os.path.getsize(p) for p in paths if os.path.exists(p))
+
+def run_library(shelf_count, button_count, repeat):
+    root = tempfile.mkdtemp(prefix="spShelf_bench_")
+    cmds.user_dir = root
+    cmds.reset()
+    try:
+        shelf_dir = cmds.internalVar(userShelfDir=True)
+        os.makedirs(shelf_dir)
+        os.makedirs(os.path.join(root, cmds.about(version=True), "scripts"))
+        text = make_shelf_text(button_count)
+        names = [f"Bench{n}" for n in range(shelf_count)]
+        paths = []
+        for name in names:
+            paths.append(os.path.join(shelf_dir, f"shelf_{name}.mel"))
+            with open(paths[-1], "w", encoding="utf-8") as f:
+                f.write(text)
+
+        parser = spShelf.SpShelf.__new__(spShelf.SpShelf)
+        buttons = parser.parse_shelf_file(paths[0])
+        result = {"shelves": shelf_count, "buttons_per_shelf": button_count,
+                  "buttons": sum(1 for b in buttons if b.get("type") != "separator") * shelf_count}
+        result["parse_ms"], _ = best_of(repeat, lambda: [parser.parse_shelf_file(p) for p in paths])
+        result["parse_buttons_per_s"] = result["buttons"] / (result["parse_ms"] / 1000.0)
+
+        # Import through the real entry point, one shelf tab at a time
+        shelf = spShelf.SpShelf()
+        cmds.shelfTabLayout("ShelfLayout")
+        start = time.perf_counter()
+        for name in names:
+            cmds.shelfTabLayout("ShelfLayout", edit=True, selectTab=name)
+            shelf.add_current_shelf()
+        flush(shelf)
+        result["import_ms"] = (time.perf_counter() - start) * 1000.0
+        del cmds.deferred[:] # Reopen requests queued by add_current_shelf
+
+        if hasattr(shelf, "import_shelves"):
+            # Same files through the bulk import, into an empty store of its own
+            cmds.user_dir = os.path.join(root, "bulk")
+            os.makedirs(os.path.join(cmds.user_dir, cmds.about(version=True), "scripts"))
+            bulk = spShelf.SpShelf()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()): # Per file report
+                bulk.import_shelves(paths)
+            flush(bulk)
+            result["bulk_import_ms"] = (time.perf_counter() - start) * 1000.0
+            cmds.user_dir = root
+
+        if "content" in inspect.signature(shelf.save_user_data).parameters:
+            result["save_all_ms"], _ = best_of(repeat, lambda: (shelf.save_user_data(content=shelf.shelves), flush(shelf)))
+        else:
+            # Single-file store, every save writes everything
+            result["save_all_ms"], _ = best_of(repeat, lambda: (shelf.save_user_data(), flush(shelf)))
+        result["save_state_ms"], _ = best_of(repeat, lambda: (shelf.save_user_data(), flush(shelf)))
+        result["json_bytes"] = store_size(shelf)
+
+        def cold_start():
+            if hasattr(spShelf, "_icon_cache"):
+                spShelf._icon_cache.clear()
+            return spShelf.SpShelf()
+        result["load_ms"], _ = best_of(repeat, cold_start)
+
+        def build(instance):
+            # Window build only: (ms, cmds calls, UI objects, time inside the fake)
+            if cmds.window(instance.WINDOW_NAME, exists=True):
+                cmds.deleteUI(instance.WINDOW_NAME, window=True)
+            before = ui_totals()
+            start = time.perf_counter()
+            instance.create_window()
+            elapsed = (time.perf_counter() - start) * 1000.0
+            after = ui_totals()
+            return [elapsed] + [a - b for a, b in zip(after, before)]
+        cold = min((build(cold_start()) for _ in range(repeat)), key=lambda run: run[0])
+        result["cold_window_ms"], calls, objects, fake_seconds = cold
+        result["ui_objects"] = objects
+        result["cmds_calls"] = calls
+        result["cmds_ms"] = fake_seconds * 1000.0
+        warm = cold_start()
+        build(warm)
+        result["warm_window_ms"] = min(build(warm)[0] for _ in range(repeat))
+
+        if hasattr(warm, "search"):
+            def index():
+                warm._search_index = type(warm._search_index)()
+                warm.update_search_index(build=True)
+            result["search_index_ms"], _ = best_of(repeat, index)
+            result["search_ms"] = max(best_of(repeat, lambda: warm.search(q))[0] for q in SEARCH_QUERIES)
+        return result
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+def git_revision(path):
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=path,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+COLUMNS = (
+    # (header, key, width, format), missing metrics are shown as "-"
+    ("shelves", "shelves", 7, "{}"),
+    ("btns", "buttons_per_shelf", 5, "{}"),
+    ("parse btn/s", "parse_buttons_per_s", 12, "{:,.0f}"),
+    ("import", "import_ms", 9, "{:.1f}ms"),
+    ("bulk", "bulk_import_ms", 9, "{:.1f}ms"),
+    ("load", "load_ms", 8, "{:.1f}ms"),
+    ("cold win", "cold_window_ms", 9, "{:.1f}ms"),
+    ("warm win", "warm_window_ms", 9, "{:.1f}ms"),
+    ("ui objs", "ui_objects", 8, "{}"),
+    ("calls", "cmds_calls", 7, "{}"),
+    ("save all", "save_all_ms", 9, "{:.1f}ms"),
+    ("save st", "save_state_ms", 8, "{:.1f}ms"),
+    ("json KB", "json_bytes", 8, "{:.1f}"),
+    ("index", "search_index_ms", 8, "{:.1f}ms"),
+    ("search", "search_ms", 7, "{:.2f}ms"),
+)
+
+def print_results(results, baseline=None):
+    previous = {}
+    if baseline:
+        previous = {(r["shelves"], r["buttons_per_shelf"]): r for r in baseline["results"]}
+    header = " ".join(f"{title:>{width}}" for title, _, width, _ in COLUMNS)
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        cells = []
+        for _, key, width, fmt in COLUMNS:
+            value = r.get(key)
+            if key == "json_bytes" and value is not None:
+                value /= 1024
+            cells.append(f"{'-' if value is None else fmt.format(value):>{width}}")
+        print(" ".join(cells))
+        old = previous.get((r["shelves"], r["buttons_per_shelf"]))
+        if old:
+            changes = []
+            for key in TIME_METRICS + ("ui_objects", "cmds_calls", "json_bytes"):
+                if old.get(key) and r.get(key) is not None:
+                    changes.append(f"{key} {(r[key] / old[key] - 1) * 100:+.0f}%")
+            print("        vs baseline: " + ", ".join(changes))
+
+def main():
+    global spShelf, make_shelf_text
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shelves", type=int, nargs="+", default=SHELF_COUNTS)
+    parser.add_argument("--buttons", type=int, nargs="+", default=BUTTON_COUNTS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--spshelf", default=os.path.dirname(HERE),
+                        help="folder (or spShelf.py) of the checkout to benchmark, defaults to this one")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare against")
+    args = parser.parse_args()
+
+    target = os.path.abspath(args.spshelf)
+    if os.path.isfile(target):
+        target = os.path.dirname(target)
+    sys.path.insert(0, target)
+    spShelf = importlib.import_module("spShelf")
+    make_shelf_text = importlib.import_module("bench_parse").make_shelf_text
+    print(f"benchmarking {spShelf.__file__}")
+
+    results = []
+    for shelf_count in args.shelves:
+        for button_count in args.buttons:
+            results.append(run_library(shelf_count, button_count, args.repeat))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.output:
+        report = {"revision": git_revision(target), "python": platform.python_version(),
+                  "repeat": args.repeat, "results": results}
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
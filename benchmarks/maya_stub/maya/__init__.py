@@ -0,0 +1,4 @@
+"""
+Minimal stand-in for the `maya` package so spShelf can be imported outside of Maya.
+Only meant for the benchmarks in this folder.
+"""
@@ -0,0 +1,122 @@
+"""
+Headless stand-in for maya.cmds used by the benchmarks.
+
+UI commands keep a small control tree (create / exists / query / edit / deleteUI) so
+spShelf runs unchanged, and every call is counted and timed per command name.
+"""
+import collections
+import os
+import tempfile
+import time
+
+# Redirected by the benchmarks to an isolated folder per scenario
+user_dir = os.path.join(tempfile.gettempdir(), "spShelf_bench")
+
+counts = collections.Counter() # command name -> number of calls
+created = collections.Counter() # command name -> number of UI objects created
+seconds = collections.Counter() # command name -> time spent inside the fake
+controls = {} # control name -> {"type", "parent", "flags"}
+deferred = []
+
+_next_id = [0]
+
+def reset():
+    counts.clear()
+    created.clear()
+    seconds.clear()
+    controls.clear()
+    del deferred[:]
+
+def run_deferred():
+    # Runs evalDeferred callbacks, including ones queued while running
+    while deferred:
+        fn = deferred.pop(0)
+        if callable(fn):
+            fn()
+
+def _timed(name, fn):
+    def command(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            counts[name] += 1
+            seconds[name] += time.perf_counter() - start
+    command.__name__ = name
+    return command
+
+_QUERY_DEFAULTS = {"width": 200, "height": 200, "visible": False, "value": 0, "collapse": False,
+                   "childArray": None, "selectTab": "Bench"}
+
+def _ui_command(type_name):
+    def command(*args, **kwargs):
+        name = args[0] if args else None
+        if kwargs.get("exists") or kwargs.get("ex"):
+            return name in controls
+        if kwargs.get("query") or kwargs.get("q"):
+            flags = controls.get(name, {}).get("flags", {})
+            flag = next(k for k in kwargs if k not in ("query", "q"))
+            return flags.get(flag, _QUERY_DEFAULTS.get(flag))
+        if kwargs.get("edit") or kwargs.get("e"):
+            if name in controls:
+                controls[name]["flags"].update(kwargs)
+            return None
+        _next_id[0] += 1
+        name = name or f"{type_name}{_next_id[0]}"
+        controls[name] = {"type": type_name, "parent": kwargs.get("parent"), "flags": kwargs}
+        created[type_name] += 1
+        return name
+    return command
+
+for _type in ("window", "columnLayout", "rowLayout", "frameLayout", "scrollLayout", "formLayout",
+              "iconTextButton", "button", "checkBox", "intField", "textField", "text", "separator",
+              "popupMenu", "menuItem", "shelfTabLayout"):
+    globals()[_type] = _timed(_type, _ui_command(_type))
+
+def _delete_ui(*names, **kwargs):
+    doomed = set(n for n in names if n in controls)
+    # Children go with their parents
+    changed = True
+    while changed:
+        changed = False
+        for name, control in controls.items():
+            if name not in doomed and control["parent"] in doomed:
+                doomed.add(name)
+                changed = True
+    for name in doomed:
+        del controls[name]
+
+def _show_window(name):
+    controls[name]["flags"]["visible"] = True
+
+def _internal_var(userAppDir=False, userShelfDir=False, userBitmapsDir=False, **kwargs):
+    if userShelfDir:
+        return os.path.join(user_dir, "prefs", "shelves") + os.sep
+    if userBitmapsDir:
+        return os.path.join(user_dir, "prefs", "icons") + os.sep
+    return user_dir + os.sep
+
+def _warning(message):
+    print(f"Warning: {message}")
+
+_COMMANDS = {
+    "deleteUI": _delete_ui,
+    "showWindow": _show_window,
+    "internalVar": _internal_var,
+    "about": lambda version=False, **kwargs: "bench",
+    "warning": _warning,
+    "evalDeferred": lambda fn, **kwargs: deferred.append(fn),
+    "scriptJob": lambda **kwargs: 1,
+    "windowPref": lambda *args, **kwargs: False,
+    "confirmDialog": lambda **kwargs: "Yes",
+    # Every icon is treated as a Maya resource
+    "resourceManager": lambda nameFilter=None, **kwargs: [nameFilter] if nameFilter else [],
+}
+for _name, _fn in _COMMANDS.items():
+    globals()[_name] = _timed(_name, _fn)
+
+def __getattr__(name):
+    # Any other command is accepted and does nothing
+    fn = _timed(name, lambda *args, **kwargs: None)
+    globals()[name] = fn
+    return fn
@@ -0,0 +1,6 @@
+calls = 0
+
+def eval(command):
+    global calls
+    calls += 1
+    return None
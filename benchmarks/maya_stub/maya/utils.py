@@ -0,0 +1,3 @@
+def executeDeferred(fn, *args, **kwargs):
+    if callable(fn):
+        fn(*args, **kwargs)
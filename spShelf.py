@@ -9,20 +9,572 @@
 
 import maya.cmds as cmds
 import maya.mel as mel
+import maya.utils
 import os
+import re
+import types
+import importlib
+import contextlib
+import collections
 import json
 import time
+import atexit
+import threading
+import hashlib
+import functools
+import heapq
+from functools import partial
 
-try:
-    from PySide6.QtGui import QCursor
-except ImportError:
-    try:
-        from PySide2.QtGui import QCursor
-    except ImportError:
-        QCursor = None
+# PySide is imported on first use only (see _import_qt), importing this module does no Qt work
+_qt = None
+
+def _load_qt_binding(pyside, shiboken):
+    qt_core = importlib.import_module(f"{pyside}.QtCore")
+    qt_gui = importlib.import_module(f"{pyside}.QtGui")
+    qt_widgets = importlib.import_module(f"{pyside}.QtWidgets")
+    omui = importlib.import_module("maya.OpenMayaUI")
+    qt = types.SimpleNamespace(
+        Qt=qt_core.Qt, QSize=qt_core.QSize, QTimer=qt_core.QTimer,
+        QCursor=qt_gui.QCursor, QIcon=qt_gui.QIcon, QPainter=qt_gui.QPainter, QGuiApplication=qt_gui.QGuiApplication,
+        QWidget=qt_widgets.QWidget, QVBoxLayout=qt_widgets.QVBoxLayout, QHBoxLayout=qt_widgets.QHBoxLayout,
+        QFrame=qt_widgets.QFrame, QLabel=qt_widgets.QLabel, QMenu=qt_widgets.QMenu,
+        wrapInstance=importlib.import_module(shiboken).wrapInstance, omui=omui)
+    qt.ShelfToolButton = _make_shelf_tool_button(qt, qt_widgets.QToolButton)
+    return qt
+
+def _import_qt():
+    """
+    Returns a namespace with the Qt names spShelf uses (PySide6, then PySide2),
+    or None when Qt is not available.
+    """
+    global _qt
+    if _qt is None:
+        _qt = False
+        for pyside, shiboken in (("PySide6", "shiboken6"), ("PySide2", "shiboken2")):
+            try:
+                _qt = _load_qt_binding(pyside, shiboken)
+                break
+            except ImportError:
+                continue
+    return _qt or None
+
+def _make_shelf_tool_button(qt, QToolButton):
+    class ShelfToolButton(QToolButton):
+        """
+        Shelf button for the Qt backend: draws the overlay label like iconTextButton
+        and runs a separate callback on double-click.
+        """
+        def __init__(self, overlay_label="", parent=None):
+            super().__init__(parent)
+            self.overlay_label = overlay_label
+            self.double_click_callback = None
+            self.context_menu = None
+
+        def mouseDoubleClickEvent(self, event):
+            if self.double_click_callback:
+                self.double_click_callback()
+                event.accept()
+            else:
+                super().mouseDoubleClickEvent(event)
+
+        def paintEvent(self, event):
+            super().paintEvent(event)
+            if self.overlay_label:
+                painter = qt.QPainter(self)
+                painter.setPen(qt.Qt.white)
+                painter.drawText(self.rect().adjusted(1, 1, -1, -1), qt.Qt.AlignHCenter | qt.Qt.AlignBottom, self.overlay_label)
+                painter.end()
+    return ShelfToolButton
+
+# Tokens of the MEL subset used by shelf files. Strings keep their raw (still escaped) text,
+# _parse_shelf_text unescapes the ones that are only displayed.
+# Leading whitespace and comments are folded into each match so they cost no extra iteration.
+_MEL_TOKEN_RE = re.compile(r"""
+    (?:\s+|//[^\n]*|/\*.*?\*/)*
+    (?:
+        "(?P<string>[^"\\]*(?:\\.[^"\\]*)*)"
+      | (?P<flag>-[A-Za-z_]\w*)
+      | (?P<punct>[();{}+])
+      | (?P<word>[^\s"();{}+]+)
+    )
+""", re.S | re.X)
+
+# shelfButton string flags we keep, long and short names mapped to the stored key
+_SHELF_BUTTON_STRING_FLAGS = {
+    "-label": "label", "-l": "label",
+    "-annotation": "annotation", "-ann": "annotation",
+    "-image": "image", "-i": "image",
+    "-image1": "image1", "-i1": "image1",
+    "-imageOverlayLabel": "imageOverlayLabel", "-iol": "imageOverlayLabel",
+    "-command": "command", "-c": "command",
+    "-doubleClickCommand": "doubleClickCommand", "-dcc": "doubleClickCommand",
+    "-sourceType": "sourceType", "-stp": "sourceType",
+}
+# Commands stay raw, they are decoded when run. Every other string is unescaped at parse time.
+_RAW_STRING_KEYS = ("command", "doubleClickCommand")
+
+_MEL_ESCAPE_RE = re.compile(r"\\(.)", re.S)
+_MEL_ESCAPES = {"n": "\n", "t": "\t", "r": "\r"}
+
+def _mel_unescape(string):
+    # Value of a MEL string literal: \" -> ", \\ -> \, \n -> newline, ...
+    if "\\" not in string:
+        return string
+    return _MEL_ESCAPE_RE.sub(lambda m: _MEL_ESCAPES.get(m.group(1), m.group(1)), string)
+
+class _MelTokenStream:
+    """
+    Single-pass stream over MEL tokens with one token of lookahead.
+    """
+    def __init__(self, text):
+        self._matches = _MEL_TOKEN_RE.finditer(text)
+        self._peeked = None
+
+    def next(self):
+        if self._peeked is not None:
+            token, self._peeked = self._peeked, None
+            return token
+        m = next(self._matches, None)
+        if m is None:
+            return None, None
+        kind = m.lastgroup
+        return kind, m.group(kind)
+
+    def peek(self):
+        if self._peeked is None:
+            self._peeked = self.next()
+        return self._peeked
+
+    def read_string(self):
+        # string_expr := term ('+' term)* ; term := STRING | '(' string_expr ')'
+        # Returns the concatenated raw text, or None if the next token does not start a string
+        kind, value = self.peek()
+        if kind == "string":
+            self.next()
+            text = value
+        elif kind == "punct" and value == "(":
+            self.next()
+            text = self.read_string()
+            if self.peek() == ("punct", ")"):
+                self.next()
+            if text is None:
+                return None
+        else:
+            return None
+        while self.peek() == ("punct", "+"):
+            self.next()
+            tail = self.read_string()
+            if tail is None:
+                break
+            text += tail
+        return text
+
+def _parse_shelf_text(text):
+    """
+    Parses the shelfButton/separator statements of a shelf MEL file in one pass.
+    Commands are kept raw (escapes intact), exactly as the command text will be executed.
+    Labels, annotations and other display strings are unescaped.
+    """
+    buttons = []
+    tokens = _MelTokenStream(text)
+    current = None # Statement being parsed, None while outside shelfButton/separator
+    python_menu_items = []
+
+    def finish(item):
+        if item.get("type") == "separator":
+            buttons.append(item)
+            return
+        menu_items = item.get("menuItems", [])
+        for i, menu_item in enumerate(menu_items):
+            menu_item["sourceType"] = "python" if i in python_menu_items else "mel"
+        if item:
+            buttons.append(item)
+
+    while True:
+        kind, value = tokens.next()
+        if kind is None:
+            break
+        if kind == "word" and value in ("shelfButton", "separator"):
+            if current is not None:
+                finish(current)
+            current = {"type": "separator"} if value == "separator" else {}
+            python_menu_items = []
+            continue
+        if current is None:
+            continue
+        if kind == "punct" and value in (";", "}"):
+            finish(current)
+            current = None
+        elif kind == "flag" and "type" not in current:
+            if value in _SHELF_BUTTON_STRING_FLAGS:
+                string = tokens.read_string()
+                if string is not None:
+                    key = _SHELF_BUTTON_STRING_FLAGS[value]
+                    current[key] = string if key in _RAW_STRING_KEYS else _mel_unescape(string)
+            elif value in ("-mi", "-menuItem"):
+                label = tokens.read_string()
+                command = tokens.read_string()
+                if label is not None and command is not None:
+                    current.setdefault("menuItems", []).append({"label": _mel_unescape(label), "command": command})
+            elif value in ("-mip", "-menuItemPython"):
+                kind, index = tokens.peek()
+                if kind == "word" and index.isdigit():
+                    tokens.next()
+                    python_menu_items.append(int(index))
+
+    if current is not None:
+        finish(current)
+    return buttons
+
+class _PhaseStats:
+    """
+    Per-phase durations (show/hide/rebuild steps, button execution) kept as rolling windows
+    of recent samples. Off by default; when disabled phase() hands out a shared no-op
+    context manager and _timed() adds a single flag check per call.
+    """
+    WINDOW = 256 # Samples kept per phase
+
+    def __init__(self):
+        self.enabled = False
+        self._samples = {}
+
+    def phase(self, name):
+        return _PhaseTimer(self, name) if self.enabled else _NULL_PHASE
+
+    def record(self, name, seconds):
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples[name] = collections.deque(maxlen=self.WINDOW)
+        samples.append(seconds)
+
+    def reset(self):
+        self._samples.clear()
+
+    def summary(self):
+        result = {}
+        for name, samples in self._samples.items():
+            ordered = sorted(samples)
+            def percentile(p):
+                return ordered[int(round(p * (len(ordered) - 1)))] * 1000.0
+            result[name] = {
+                "count": len(ordered),
+                "p50_ms": percentile(0.5),
+                "p90_ms": percentile(0.9),
+                "p99_ms": percentile(0.99),
+                "max_ms": ordered[-1] * 1000.0,
+            }
+        return result
+
+class _PhaseTimer:
+    __slots__ = ("stats", "name", "start")
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.record(self.name, time.perf_counter() - self.start)
+        return False
+
+_NULL_PHASE = contextlib.nullcontext()
+_stats = _PhaseStats()
+
+def _timed(name):
+    # Method decorator recording the call duration under `name` while stats are enabled
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _stats.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _stats.record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+class _DeferredWriter:
+    """
+    Coalesces bursts of save requests into one write per file after a quiet period.
+    Serialization happens on a single worker thread; files are written to a temp file and
+    atomically renamed so a crash mid-write never truncates the store.
+    """
+    def __init__(self, delay, on_written=None):
+        self.delay = delay
+        self.on_written = on_written
+        self._lock = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._pending = {}
+        self._deadline = None # Monotonic time of the next write, None when nothing is scheduled
+        self._worker = None
+        self._writing = 0
+
+    def submit(self, path, data):
+        with self._lock:
+            self._pending[path] = data
+            self._deadline = time.monotonic() + self.delay
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="spShelfWriter", daemon=True)
+                self._worker.start()
+            self._lock.notify()
+
+    def _run(self):
+        # Worker loop: waits until no save was submitted for `delay` seconds, then writes
+        while True:
+            with self._lock:
+                while True:
+                    remaining = None if self._deadline is None else self._deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        break
+                    self._lock.wait(remaining)
+                self._deadline = None
+            self.flush()
+
+    def has_pending(self):
+        with self._lock:
+            return bool(self._pending or self._writing)
+
+    def flush(self):
+        # Called from the worker thread, or synchronously on exit. The I/O lock is taken before the
+        # pending data is swapped out, so a synchronous flush waits for a write in progress instead
+        # of returning while the worker still holds the data.
+        with self._io_lock:
+            with self._lock:
+                self._deadline = None
+                pending, self._pending = self._pending, {}
+                self._writing += 1
+            # Disk I/O happens outside the state lock so submit() never waits on it
+            try:
+                for path, data in pending.items():
+                    try:
+                        self._write(path, data)
+                    except (OSError, TypeError, ValueError) as e:
+                        maya.utils.executeDeferred(cmds.warning, f"Failed to save {path}: {e}")
+            finally:
+                with self._lock:
+                    self._writing -= 1
+
+    def _write(self, path, data):
+        # None means the file is no longer needed
+        if data is None:
+            if os.path.exists(path):
+                os.remove(path)
+            if self.on_written:
+                self.on_written(path)
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        if self.on_written:
+            self.on_written(path)
+
+class _IconCache:
+    """
+    Resolves shelf icon names once per session (XBMLANGPATH folders, then Maya's resources)
+    and shares the loaded QIcons across buttons and window rebuilds.
+    """
+    DEFAULT_ICON = "commandButton.png"
+
+    def __init__(self):
+        self._resolved = {} # icon name -> path or ":/" resource, None if missing
+        self._dir_entries = None # search dir -> set of file names, listed once
+        self._qicons = {}
+
+    def clear(self):
+        self._resolved.clear()
+        self._dir_entries = None
+        self._qicons.clear()
+
+    def _search_dirs(self):
+        if self._dir_entries is None:
+            self._dir_entries = {}
+            dirs = os.environ.get("XBMLANGPATH", "").split(os.pathsep)
+            dirs.append(cmds.internalVar(userBitmapsDir=True))
+            for d in dirs:
+                # Linux entries look like "/path/%B"
+                d = d.replace("%B", "").rstrip("/\\")
+                if d and d not in self._dir_entries and os.path.isdir(d):
+                    try:
+                        self._dir_entries[d] = set(os.listdir(d))
+                    except OSError:
+                        pass
+        return self._dir_entries
+
+    def resolve(self, icon):
+        if icon in self._resolved:
+            return self._resolved[icon]
+        path = None
+        if os.path.isabs(icon):
+            if os.path.isfile(icon):
+                path = icon
+        else:
+            for d, entries in self._search_dirs().items():
+                if icon in entries:
+                    path = os.path.join(d, icon)
+                    break
+            if path is None and cmds.resourceManager(nameFilter=icon):
+                path = ":/" + icon
+        self._resolved[icon] = path
+        return path
+
+    def image(self, icon):
+        # Value for iconTextButton -image1, the original name is kept if it can't be resolved
+        return self.resolve(icon) or icon
+
+    def qicon(self, icon):
+        path = self.image(icon)
+        qicon = self._qicons.get(path)
+        if qicon is None:
+            qicon = _import_qt().QIcon(path)
+            self._qicons[path] = qicon
+        return qicon
+
+    def missing(self, buttons):
+        icons = {b.get("image", self.DEFAULT_ICON) for b in buttons if b.get("type") != "separator"}
+        return sorted(icon for icon in icons if self.resolve(icon) is None)
+
+_icon_cache = _IconCache()
+
+class _SearchIndex:
+    """
+    Trigram index over button label, annotation, imageOverlayLabel and shelf name for the
+    quick-search field. Words shorter than a trigram are matched against word prefixes.
+    Shelves are re-indexed one at a time when their buttons change.
+    """
+    FIELDS = ("label", "annotation", "imageOverlayLabel")
+    PREFIX_LENGTH = 2
+    _WORD_RE = re.compile(r"\w+")
+
+    def __init__(self):
+        self.built = False
+        self._entries = {} # entry id -> (shelf name, button, lowercase label, lowercase text)
+        self._postings = {} # trigram or short word prefix -> set of entry ids
+        self._shelves = {} # shelf id -> (button list, shelf name, entry ids)
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _keys(self, text):
+        keys = {text[i:i + 3] for i in range(len(text) - 2)}
+        for word in self._WORD_RE.findall(text):
+            keys.update(word[:n] for n in range(1, self.PREFIX_LENGTH + 1))
+        return keys
+
+    def refresh(self, shelves, limit=None):
+        # Indexes added or changed shelves and drops removed ones. Button lists are replaced rather than
+        # edited, so an unchanged shelf is one that still has the indexed list and name.
+        # With `limit`, stops after indexing that many shelves and returns False if more are left.
+        current = set()
+        indexed_count = 0
+        for shelf in shelves:
+            current.add(shelf["id"])
+            indexed = self._shelves.get(shelf["id"])
+            if indexed is None or indexed[0] is not shelf.get("buttons") or indexed[1] != shelf.get("name"):
+                if limit is not None and indexed_count >= limit:
+                    return False
+                self.add_shelf(shelf)
+                indexed_count += 1
+        for shelf_id in [i for i in self._shelves if i not in current]:
+            self.remove_shelf(shelf_id)
+        self.built = True
+        return True
+
+    def add_shelf(self, shelf):
+        self.remove_shelf(shelf["id"])
+        name = shelf.get("name", "")
+        entry_ids = []
+        for b in shelf.get("buttons", []):
+            if b.get("type") == "separator":
+                continue
+            label = b.get("label", "").lower()
+            text = "\n".join([label] + [b.get(key, "").lower() for key in self.FIELDS[1:]] + [name.lower()])
+            self._next_id += 1
+            self._entries[self._next_id] = (name, b, label, text)
+            for key in self._keys(text):
+                posting = self._postings.get(key)
+                if posting is None:
+                    posting = self._postings[key] = set()
+                posting.add(self._next_id)
+            entry_ids.append(self._next_id)
+        self._shelves[shelf["id"]] = (shelf.get("buttons"), name, entry_ids)
+
+    def remove_shelf(self, shelf_id):
+        indexed = self._shelves.pop(shelf_id, None)
+        if indexed is None:
+            return
+        for entry_id in indexed[2]:
+            for key in self._keys(self._entries.pop(entry_id)[3]):
+                posting = self._postings[key]
+                posting.discard(entry_id)
+                if not posting:
+                    del self._postings[key]
+
+    def _match(self, word):
+        if len(word) < 3:
+            return set(self._postings.get(word, ()))
+        postings = []
+        for i in range(len(word) - 2):
+            posting = self._postings.get(word[i:i + 3])
+            if posting is None:
+                return set()
+            postings.append(posting)
+        postings.sort(key=len)
+        matches = postings[0].intersection(*postings[1:])
+        if len(postings) > 1:
+            # Trigrams can come from different places in the text, check the whole word
+            matches = {i for i in matches if word in self._entries[i][3]}
+        return matches
+
+    def search(self, query, limit):
+        """
+        Returns up to `limit` (shelf name, button) pairs matching every word of the query.
+        Buttons whose label starts with the first word come first, then other label matches.
+        """
+        words = query.lower().split()
+        if not words:
+            return []
+        candidates = None
+        for word in sorted(words, key=len, reverse=True):
+            matches = self._match(word)
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+        first = words[0]
+        def rank(entry_id):
+            label = self._entries[entry_id][2]
+            if label.startswith(first):
+                return (0, entry_id)
+            if first in label:
+                return (1, entry_id)
+            return (2, entry_id)
+        return [self._entries[i][:2] for i in heapq.nsmallest(limit, candidates, key=rank)]
 
 class SpShelf:
     WINDOW_NAME = "sp_shelf_window_main"
+    # Settings that can be patched into an existing window by re-flowing the shelf rows
+    REFLOW_SETTINGS = ("COLUMN_COUNT", "SHOW_SEPARATORS", "HORIZONTAL_SEPARATORS", "DOTTED_SEPARATORS", "QT_BUTTON_GRID")
+    # Settings baked into the window itself at creation, changing them needs a full rebuild
+    REBUILD_SETTINGS = ("TOOLBOX_WINDOW_STYLE", "RESIDENT_WINDOW", "SHOW_SEARCH")
+    SAVE_DELAY = 0.5 # Quiet period in seconds before pending changes are written
+    # Shelf keys stored in the per-shelf content files, everything else lives in the small state file
+    SHELF_CONTENT_KEYS = ("buttons",)
+    SYNC_INTERVAL = 2.0 # Minimum seconds between checks of the source shelf files
+    SEARCH_RESULT_COUNT = 8 # Result buttons shown under the search field
+    # Settings and collapsed states the fitted window size depends on, see layout_signature
+    LAYOUT_SETTINGS = ("COLUMN_COUNT", "SHOW_SEPARATORS", "HORIZONTAL_SEPARATORS", "DOTTED_SEPARATORS", "QT_BUTTON_GRID",
+                       "TOOLBOX_WINDOW_STYLE", "SHOW_SEARCH", "SHOW_FRAME_LABEL", "SETTINGS_COLLAPSED", "DELETE_COLLAPSED")
+    WINDOW_SIZE_CACHE = 32 # Measured window sizes kept, one per layout signature
+    IMPORT_WORKERS = 8 # Threads reading shelf files during a bulk import
     DEFAULT_WINDOW = {"width": 200, "height": 200}
     DEFAULT_SETTINGS = {
         "COLUMN_COUNT": 4, 
@@ -35,17 +587,31 @@ class SpShelf:
         "DELETE_COLLAPSED": True,
         "SHOW_SEPARATORS": True,
         "HORIZONTAL_SEPARATORS": False,
-        "DOTTED_SEPARATORS": False
+        "DOTTED_SEPARATORS": False,
+        "RESIDENT_WINDOW": False,
+        "LIVE_SHELF_SYNC": True,
+        "LOG_COMMANDS": True,
+        "CLOSE_DELAY_MS": 200,
+        "QT_BUTTON_GRID": False,
+        "SHOW_SEARCH": False
     }
 
     def __init__(self):
         self.user_app_dir = cmds.internalVar(userAppDir=True)
         self.user_version = cmds.about(version=True)
-        self.user_data_file = os.path.join(self.user_app_dir, self.user_version, 'scripts', 'sp_shelf_data.json')
+        self.user_scripts_dir = os.path.join(self.user_app_dir, self.user_version, 'scripts')
+        # Frequently written UI state (collapsed flags, labels, window, settings)
+        self.user_state_file = os.path.join(self.user_scripts_dir, 'sp_shelf_state.json')
+        # Rarely written button content, one file per shelf
+        self.user_content_dir = os.path.join(self.user_scripts_dir, 'sp_shelf_shelves')
+        # Single-file store of older versions, migrated on first load
+        self.legacy_data_file = os.path.join(self.user_scripts_dir, 'sp_shelf_data.json')
+        self.user_shelf_dir = cmds.internalVar(userShelfDir=True)
         
         # UI Elements references
         self.column_input = None
         self.screen_height_input = None
+        self.close_delay_input = None
         self.close_on_repeat_toggle = None
         self.show_window_under_cursor_toggle = None
         self.show_frame_label_toggle = None
@@ -53,6 +619,53 @@ class SpShelf:
         self.show_separators_toggle = None
         self.horizontal_separators_toggle = None
         self.dotted_separators_toggle = None
+        self.resident_window_toggle = None
+        self.live_shelf_sync_toggle = None
+        self.log_commands_toggle = None
+        self.qt_button_grid_toggle = None
+        self.show_search_toggle = None
+        self.search_field = None
+        self.search_result_buttons = []
+        self.shelves_layout = None
+        self.shelf_frames = []
+        self.shelf_contents = []
+        # Per-window dispatch table: button id -> (shelf, button). Controls only carry the id,
+        # the button and its current index are looked up when the callback fires.
+        self._button_registry = {}
+        self._next_button_id = 0
+        # (command, source type) of the last Qt button click, run by Repeat Last
+        self._repeat_command = None
+        
+        # Resident mode bookkeeping: the data revision only changes when the
+        # files on disk changed behind our back, so a built window stays valid
+        # until then (in-session edits rebuild explicitly via reopen=True).
+        self._revision = 0
+        self._disk_stamps = {}
+        self._stored_shelf_ids = set()
+        self._window_revision = None
+        # Parsed store is kept in memory and only re-read when the file stat changes
+        self.load_stats = {"hits": 0, "misses": 0}
+        self._last_sync_time = 0.0
+        # Bumped on every press, a scheduled close only runs if no press happened since
+        self._close_token = 0
+        # Set while a coalesced resize is queued, see request_resize
+        self._resize_pending = False
+        # Cursor position of a placement made before the layout was measured, see position_window
+        self._reposition_at = None
+        # (source_type, raw command) -> (decoded text or code object, first line for logging)
+        self._command_cache = {}
+        # shelf id -> (button list, row settings, rows), see shelf_rows
+        self._row_cache = {}
+        # Quick-search index, built on idle once the search field exists (or by prewarm) and then
+        # kept in step with the shelves
+        self._search_index = _SearchIndex()
+        self._search_index_pending = False
+        self._search_hits = []
+        
+        self._writer = _DeferredWriter(self.SAVE_DELAY, on_written=self._on_data_written)
+        # Make sure nothing pending is lost when Maya quits
+        atexit.register(self.flush_user_data)
+        cmds.scriptJob(event=["quitApplication", self.flush_user_data])
         
         self.shelves = []
         self.window_data = self.DEFAULT_WINDOW.copy()
@@ -60,110 +673,453 @@ class SpShelf:
         
         self.load_user_data()
 
+    def _file_stamp(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _content_file(self, shelf_id):
+        return os.path.join(self.user_content_dir, f"{shelf_id}.json")
+
+    def _read_json(self, path):
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def _load_shelf_content(self, shelf_id):
+        path = self._content_file(shelf_id)
+        try:
+            return self._read_json(path)
+        except FileNotFoundError:
+            cmds.warning(f"Shelf content file not found: {path}")
+        except (json.JSONDecodeError, ValueError):
+            cmds.warning(f"Ignoring corrupted shelf content file: {path}")
+        return {}
+
+    @_timed("load_user_data")
     def load_user_data(self):
-        if os.path.exists(self.user_data_file):
-            try:
-                with open(self.user_data_file, 'r') as f:
-                    data = json.load(f)
-                self.shelves = data.get("shelves", [])
-                self.window_data = data.get("window", self.DEFAULT_WINDOW)
-                self.settings = data.get("settings", self.DEFAULT_SETTINGS)
-                # Ensure all default settings exist
-                for k, v in self.DEFAULT_SETTINGS.items():
-                    if k not in self.settings:
-                        self.settings[k] = v
-            except (json.JSONDecodeError, ValueError):
-                cmds.warning(f"Resetting corrupted JSON file: {self.user_data_file}")
-                self.save_user_data()
+        if self._writer.has_pending():
+            # In-memory store is newer than the files until the pending write lands
+            self.load_stats["hits"] += 1
+            return
+
+        if not os.path.exists(self.user_state_file) and os.path.exists(self.legacy_data_file):
+            self.load_stats["misses"] += 1
+            self._migrate_legacy_data()
+            return
+
+        state_stamp = self._file_stamp(self.user_state_file)
+        state_changed = state_stamp != self._disk_stamps.get(self.user_state_file, False)
+        entries = None
+        if state_changed:
+            self._disk_stamps[self.user_state_file] = state_stamp
+            if state_stamp is None:
+                # File doesn't exist, use defaults
+                entries = []
+                self.window_data = self.DEFAULT_WINDOW.copy()
+                self.settings = self.DEFAULT_SETTINGS.copy()
+            else:
+                try:
+                    data = self._read_json(self.user_state_file)
+                    entries = data.get("shelves", [])
+                    self.window_data = data.get("window", self.DEFAULT_WINDOW)
+                    self.settings = data.get("settings", self.DEFAULT_SETTINGS)
+                    # Ensure all default settings exist
+                    for k, v in self.DEFAULT_SETTINGS.items():
+                        if k not in self.settings:
+                            self.settings[k] = v
+                except (json.JSONDecodeError, ValueError):
+                    cmds.warning(f"Resetting corrupted JSON file: {self.user_state_file}")
+                    entries = None
+                    self.save_user_data()
+
+        if entries is None:
+            # Content files only need a stat per shelf, they are re-read when changed on disk
+            content_changed = False
+            for shelf in self.shelves:
+                if self._refresh_shelf_content(shelf):
+                    content_changed = True
+            if not content_changed:
+                # Unchanged on disk since we last read or wrote it, keep the in-memory store
+                self.load_stats["hits"] += 1
+                return
         else:
-            # File doesn't exist, use defaults
-            self.shelves = []
-            self.window_data = self.DEFAULT_WINDOW.copy()
-            self.settings = self.DEFAULT_SETTINGS.copy()
-
-    def save_user_data(self):
-        data = {
-            "shelves": self.shelves,
-            "window": self.window_data,
-            "settings": self.settings
+            current = {shelf.get("id"): shelf for shelf in self.shelves}
+            shelves = []
+            for entry in entries:
+                shelf_id = entry.get("id")
+                if not shelf_id:
+                    continue
+                shelf = {k: v for k, v in entry.items() if k not in self.SHELF_CONTENT_KEYS}
+                if shelf_id in current:
+                    for key in self.SHELF_CONTENT_KEYS:
+                        if key in current[shelf_id]:
+                            shelf[key] = current[shelf_id][key]
+                    self._refresh_shelf_content(shelf)
+                else:
+                    self._refresh_shelf_content(shelf, force=True)
+                shelves.append(shelf)
+            self.shelves = shelves
+            self._stored_shelf_ids = {shelf["id"] for shelf in shelves}
+            # The row cache holds on to button lists, drop those of shelves that are gone
+            self._row_cache = {k: v for k, v in self._row_cache.items() if k in self._stored_shelf_ids}
+
+        self.load_stats["misses"] += 1
+        self._revision += 1
+        self.warm_command_cache()
+        self.update_search_index()
+
+    def _refresh_shelf_content(self, shelf, force=False):
+        # Re-reads the shelf's content file if it changed on disk, returns True if it did
+        path = self._content_file(shelf["id"])
+        stamp = self._file_stamp(path)
+        if not force and stamp == self._disk_stamps.get(path, False):
+            return False
+        self._disk_stamps[path] = stamp
+        content = self._load_shelf_content(shelf["id"])
+        for key in self.SHELF_CONTENT_KEYS:
+            if key in content:
+                shelf[key] = content[key]
+            else:
+                shelf.pop(key, None)
+        shelf.setdefault("buttons", [])
+        return True
+
+    def _migrate_legacy_data(self):
+        # Split the old single-file store into state + per-shelf content.
+        # The legacy file is left untouched, the new state file takes precedence from now on.
+        try:
+            data = self._read_json(self.legacy_data_file)
+        except (json.JSONDecodeError, ValueError):
+            cmds.warning(f"Skipping corrupted legacy JSON file: {self.legacy_data_file}")
+            data = {}
+        self.shelves = data.get("shelves", [])
+        self.window_data = data.get("window", self.DEFAULT_WINDOW.copy())
+        self.settings = data.get("settings", self.DEFAULT_SETTINGS.copy())
+        for k, v in self.DEFAULT_SETTINGS.items():
+            if k not in self.settings:
+                self.settings[k] = v
+        for shelf in self.shelves:
+            shelf.setdefault("id", os.urandom(6).hex())
+        self._revision += 1
+        self.save_user_data(content=self.shelves)
+        self.flush_user_data()
+        self.warm_command_cache()
+
+    def save_user_data(self, content=()):
+        """
+        Saves the UI state. Only shelves passed in `content` get their button file rewritten.
+        """
+        # Snapshot the containers on the main thread so the worker never sees them mutate.
+        # Button lists and dicts themselves are never edited in place, so sharing them is safe.
+        state = {
+            "shelves": [{k: v for k, v in shelf.items() if k not in self.SHELF_CONTENT_KEYS} for shelf in self.shelves],
+            "window": dict(self.window_data),
+            "settings": dict(self.settings)
         }
-        with open(self.user_data_file, 'w') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        self._writer.submit(self.user_state_file, state)
+
+        for shelf in content:
+            data = {"name": shelf["name"]}
+            for key in self.SHELF_CONTENT_KEYS:
+                if key in shelf:
+                    data[key] = list(shelf[key]) if isinstance(shelf[key], list) else shelf[key]
+            self._writer.submit(self._content_file(shelf["id"]), data)
+
+        # Drop content files of shelves that no longer exist
+        current_ids = {shelf["id"] for shelf in self.shelves}
+        for shelf_id in self._stored_shelf_ids - current_ids:
+            self._writer.submit(self._content_file(shelf_id), None)
+        self._stored_shelf_ids = current_ids
+
+    def flush_user_data(self):
+        self._writer.flush()
+
+    def _on_data_written(self, path):
+        # Our own writes are already reflected in the UI, don't treat them as external changes
+        self._disk_stamps[path] = self._file_stamp(path)
 
     def parse_shelf_file(self, shelf_file_path):
-        buttons = []
         if not os.path.exists(shelf_file_path):
             cmds.warning(f"Shelf file not found: {shelf_file_path}")
-            return buttons
-
-        with open(shelf_file_path, 'r') as f:
-            lines = f.readlines()
-
-        button_data = {}
-        for line in lines:
-            line = line.strip()
-            if line.startswith("shelfButton"):
-                if button_data:
-                    buttons.append(button_data)
-                button_data = {}
-            elif line.startswith("separator"):
-                if button_data:
-                    buttons.append(button_data)
-                buttons.append({"type": "separator"})
-                button_data = {}
-            elif any(line.startswith(k) for k in ["-label", "-image", "-annotation", "-command", "-sourceType", "-doubleClickCommand"]):
-                parts = line.split("\"", 1)
-                if len(parts) > 1:
-                    key = line.split()[0][1:]
-                    button_data[key] = parts[1].rsplit("\"", 1)[0]
-            elif line.startswith("-mi"):
-                menu_item_parts = line.split("(", 1)
-                if len(menu_item_parts) == 2:
-                    label = menu_item_parts[0].split("\"")[1]
-                    command = menu_item_parts[1].rsplit(")", 1)[0].strip().strip('"')
-                    button_data.setdefault("menuItems", []).append({"label": label, "command": command})
-
-        if button_data:
-            buttons.append(button_data)
-
-        return buttons
-
-    def execute_command(self, command, source_type="mel"):
+            return []
+
+        with open(shelf_file_path, 'r', encoding='utf-8', errors='replace') as f:
+            return _parse_shelf_text(f.read())
+
+    def _source_fingerprint(self, path):
+        # (stamp, content hash) of a source shelf file, or (None, None) if it is gone
+        stamp = self._file_stamp(path)
+        if stamp is None:
+            return None, None
+        with open(path, 'rb') as f:
+            data = f.read()
+        return list(stamp), hashlib.sha1(data).hexdigest()
+
+    @_timed("sync_shelves")
+    def sync_shelves(self, force=False):
+        """
+        Re-imports stored shelves whose source shelf_<name>.mel changed on disk.
+        Only the affected shelves are re-parsed and re-drawn, their collapsed/label state is kept.
+        """
+        if not force:
+            if not self.settings.get("LIVE_SHELF_SYNC", True):
+                return
+            now = time.monotonic()
+            if now - self._last_sync_time < self.SYNC_INTERVAL:
+                return
+            self._last_sync_time = now
+
+        state_changed = False
+        changed_shelves = []
+        for shelf_idx, shelf in enumerate(self.shelves):
+            source = shelf.get("source")
+            if not source:
+                # Shelves stored by older versions: link to the user shelf of the same name,
+                # taking its current state as baseline
+                candidate = os.path.join(self.user_shelf_dir, f"shelf_{shelf['name']}.mel")
+                if not os.path.exists(candidate):
+                    continue
+                shelf["source"] = candidate
+                shelf["source_stamp"], shelf["source_hash"] = self._source_fingerprint(candidate)
+                state_changed = True
+                continue
+
+            stamp = self._file_stamp(source)
+            if stamp is None or list(stamp) == shelf.get("source_stamp"):
+                continue
+            stamp, digest = self._source_fingerprint(source)
+            shelf["source_stamp"] = stamp
+            state_changed = True
+            if digest == shelf.get("source_hash"):
+                # Touched but not edited
+                continue
+            shelf["source_hash"] = digest
+            shelf["buttons"] = self.parse_shelf_file(source)
+            self.report_missing_icons(shelf)
+            changed_shelves.append(shelf_idx)
+
+        if state_changed:
+            self.save_user_data(content=[self.shelves[i] for i in changed_shelves])
+        if changed_shelves:
+            self.warm_command_cache()
+            self.update_search_index()
+            with self.suspend_updates():
+                for shelf_idx in changed_shelves:
+                    self.refresh_shelf_ui(shelf_idx)
+            self.request_resize()
+
+    def _prepare_command(self, command, source_type):
+        # Decode for safety if needed, mirroring original logic
+        try:
+            text = command.encode('utf-8').decode('unicode_escape')
+        except Exception:
+            text = command # Fallback if already decoded or issue
+
+        first_line = text.strip().split("\n", 1)[0]
+        if len(first_line) > 80:
+            first_line = first_line[:77] + "..."
+
+        runnable = text
+        if source_type == "python":
+            try:
+                runnable = compile(text, "<spShelf>", "exec")
+            except (SyntaxError, ValueError):
+                pass # Keep the text, exec reports the error on click
+        entry = (runnable, first_line)
+        self._command_cache[(source_type, command)] = entry
+        return entry
+
+    def warm_command_cache(self, shelves=None):
+        # Decodes and compiles every command up front so clicks only pay for running the tool.
+        # Without `shelves` the cache is rebuilt from all stored shelves, reusing the entries that are
+        # still needed, so commands of deleted or replaced buttons don't stay cached for the session.
+        previous = self._command_cache
+        if shelves is None:
+            shelves = self.shelves
+            self._command_cache = {}
+        for shelf in shelves:
+            for b in shelf.get("buttons", []):
+                source_type = b.get("sourceType", "mel")
+                commands = [(source_type, b.get(key)) for key in ("command", "doubleClickCommand")]
+                commands += [(item.get("sourceType", source_type), item.get("command")) for item in b.get("menuItems", [])]
+                for cache_key in commands:
+                    if cache_key[1] and cache_key not in self._command_cache:
+                        entry = previous.get(cache_key)
+                        if entry is None:
+                            self._prepare_command(cache_key[1], cache_key[0])
+                        else:
+                            self._command_cache[cache_key] = entry
+
+    def report_missing_icons(self, shelf):
+        # Reported once when a shelf is imported instead of silently failing on every build
+        missing = _icon_cache.missing(shelf.get("buttons", []))
+        if missing:
+            shown = ", ".join(missing[:10]) + (f" (+{len(missing) - 10} more)" if len(missing) > 10 else "")
+            cmds.warning(f"Shelf '{shelf['name']}' uses {len(missing)} icon(s) that could not be found: {shown}")
+
+    def button_stats_name(self, shelf_name, b, action="command"):
+        # Stats key of a button: shelf and button label, so buttons sharing a first line stay apart
+        name = b.get("label") or b.get("imageOverlayLabel") or b.get("annotation") or "Unnamed"
+        return f"execute: {shelf_name}/{name}" + ("" if action == "command" else f" [{action}]")
+
+    def execute_command(self, command, source_type="mel", stats_name=None):
         if not isinstance(command, str) or not command.strip():
             cmds.warning("Invalid or empty command provided.")
             return
-        try:
-            # Decode for safety if needed, mirroring original logic
-            try:
-                command = command.encode('utf-8').decode('unicode_escape')
-            except Exception:
-                pass # Fallback if already decoded or issue
+        entry = self._command_cache.get((source_type, command))
+        if entry is None:
+            entry = self._prepare_command(command, source_type)
+        runnable, summary = entry
 
+        if self.settings.get("LOG_COMMANDS", True):
+            print(f"Executing {'Python' if source_type == 'python' else 'MEL'} command: {summary}")
+        start = time.perf_counter() if _stats.enabled else None
+        try:
             if source_type == "python":
-                print(f"Executing Python command:\n{command}")
-                exec(command, globals())
+                exec(runnable, globals())
             else:
-                print(f"Executing MEL command:\n{command}")
-                mel.eval(command)
+                mel.eval(runnable)
         except Exception as e:
-            cmds.warning(f"Failed to execute command: {command}. Error: {e}")
+            cmds.warning(f"Failed to execute command: {summary}. Error: {e}")
+        if start is not None:
+            # Per-button timing, keyed by the button if the caller knows it, else by the command's first line
+            _stats.record(stats_name or f"execute: {summary}", time.perf_counter() - start)
+
+    def update_search_index(self, build=False):
+        # Only added, changed or removed shelves are re-indexed. Nothing is indexed until the
+        # idle build (or prewarm with the field on) ran, so setups without the search field don't pay for it.
+        if build or self._search_index.built:
+            self._search_index.refresh(self.shelves)
+
+    def build_search_index_idle(self):
+        # Indexes one shelf per idle tick, so the index is ready before the first keystroke
+        # without a long stall. Searching before it is done finishes the rest at once.
+        self._search_index_pending = False
+        if not self._search_index.refresh(self.shelves, limit=1):
+            self._search_index_pending = True
+            cmds.evalDeferred(self.build_search_index_idle, lowestPriority=True)
+
+    def search(self, query, limit=None):
+        """
+        Returns the (shelf name, button) pairs matching the query, best matches first.
+        """
+        self.update_search_index(build=True)
+        return self._search_index.search(query, limit or self.SEARCH_RESULT_COUNT)
+
+    def on_search_changed(self, text):
+        previous_count = len(self._search_hits)
+        self._search_hits = self.search(text)
+        # The result buttons are created once with the window, typing only edits them
+        for n, btn in enumerate(self.search_result_buttons):
+            if n < len(self._search_hits):
+                shelf_name, b = self._search_hits[n]
+                label = b.get("label") or b.get("imageOverlayLabel") or "Unnamed"
+                cmds.iconTextButton(btn, edit=True, visible=True, label=f"{label}  ({shelf_name})",
+                                    image1=_icon_cache.image(b.get("image", _icon_cache.DEFAULT_ICON)),
+                                    annotation=b.get("annotation", ""))
+            elif n < previous_count:
+                cmds.iconTextButton(btn, edit=True, visible=False)
+        if len(self._search_hits) != previous_count:
+            self.request_resize()
+
+    def run_search_hit(self, hit_index, *args):
+        if hit_index < len(self._search_hits):
+            shelf_name, b = self._search_hits[hit_index]
+            self.execute_command(b.get("command", ""), b.get("sourceType", "mel"),
+                                 self.button_stats_name(shelf_name, b) if _stats.enabled else None)
+
+    def on_search_enter(self, *args):
+        # Enter runs the top hit
+        self.run_search_hit(0)
 
     def on_shelf_collapse(self, shelf_index, collapsed):
         if 0 <= shelf_index < len(self.shelves):
             self.shelves[shelf_index]["collapsed"] = collapsed
             self.save_user_data()
-        self.resize_window()
+            if not collapsed:
+                self.ensure_shelf_built(shelf_index)
+        self.request_resize()
 
     def on_settings_collapse(self, key, collapsed):
         self.settings[key] = collapsed
         self.save_user_data()
-        self.resize_window()
+        self.request_resize()
+
+    def layout_signature(self):
+        # Key of the measured window size cache: shelf set, collapsed/label states and the layout settings
+        shelves = tuple((s.get("id"), s.get("collapsed", False), s.get("label_visible"), len(s.get("buttons", [])))
+                        for s in self.shelves)
+        layout = (shelves, tuple(self.settings.get(k) for k in self.LAYOUT_SETTINGS), len(self._search_hits))
+        return hashlib.sha1(repr(layout).encode("utf-8")).hexdigest()[:16]
+
+    def cached_window_size(self):
+        return self.window_data.get("sizes", {}).get(self.layout_signature())
+
+    def remember_window_size(self, key):
+        # Runs deferred after a fit pass, once the window is laid out and its size is real
+        if key != self.layout_signature() or not self.is_window_visible():
+            return
+        size = [cmds.window(self.WINDOW_NAME, query=True, width=True),
+                cmds.window(self.WINDOW_NAME, query=True, height=True)]
+        if min(size) <= 10:
+            return
+        sizes = self.window_data.get("sizes", {})
+        if sizes.get(key) != size:
+            # Replaced rather than edited in place, a pending save may still be serializing the old one
+            sizes = {k: v for k, v in sizes.items() if k != key}
+            sizes[key] = size
+            while len(sizes) > self.WINDOW_SIZE_CACHE:
+                del sizes[next(iter(sizes))]
+            self.window_data = dict(self.window_data, width=size[0], height=size[1], sizes=sizes)
+            self.save_user_data()
+        if self._reposition_at is not None:
+            # Placed with a guessed size, place it again now that the real one is known
+            cursor_pos, self._reposition_at = self._reposition_at, None
+            self.position_window(cursor_pos)
 
+    def request_resize(self):
+        # Layout changes only ask for a resize, any number of them in one event-loop tick
+        # end up in a single fit pass
+        if self._resize_pending:
+            return
+        self._resize_pending = True
+        self.call_later(0, self._run_pending_resize)
+
+    def _run_pending_resize(self):
+        if self._resize_pending:
+            self.resize_window()
+
+    @contextlib.contextmanager
+    def suspend_updates(self):
+        # Bulk frame edits repaint the window once at the end instead of after every edit
+        qt = _import_qt()
+        ptr = qt.omui.MQtUtil.findWindow(self.WINDOW_NAME) if qt is not None else None
+        if not ptr:
+            yield
+            return
+        widget = qt.wrapInstance(int(ptr), qt.QWidget)
+        widget.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            widget.setUpdatesEnabled(True)
+
+    @_timed("resize_window")
     def resize_window(self):
+        self._resize_pending = False
+        if not cmds.window(self.WINDOW_NAME, exists=True):
+            return
+        size = self.cached_window_size()
+        if size:
+            # This layout was measured before, set its size directly instead of a fit pass
+            cmds.window(self.WINDOW_NAME, edit=True, width=size[0], height=size[1])
+            return
         # Force window to recalculate size to fit children
         # setting height to 1 ensures it shrinks to minimum required height
-        if cmds.window(self.WINDOW_NAME, exists=True):
-            cmds.window(self.WINDOW_NAME, edit=True, height=1, resizeToFitChildren=True)
+        cmds.window(self.WINDOW_NAME, edit=True, height=1, resizeToFitChildren=True)
+        cmds.evalDeferred(partial(self.remember_window_size, self.layout_signature()), lowestPriority=True)
 
     def toggle_frame_labels(self, visible):
         # Callback from checkbox, visible is boolean
@@ -173,15 +1129,16 @@ class SpShelf:
         for i, shelf in enumerate(self.shelves):
             shelf["label_visible"] = visible
             
-        for frame in self.shelf_frames:
-            if cmds.frameLayout(frame, exists=True):
-                cmds.frameLayout(frame, edit=True, labelVisible=visible)
+        with self.suspend_updates():
+            for frame in self.shelf_frames:
+                if cmds.frameLayout(frame, exists=True):
+                    cmds.frameLayout(frame, edit=True, labelVisible=visible)
         
         # Save settings immediately
         self.save_user_data()
         
         # Also force resize as labels take up space
-        self.resize_window()
+        self.request_resize()
 
     def toggle_single_shelf_label(self, shelf_index, visible):
         if 0 <= shelf_index < len(self.shelves):
@@ -199,13 +1156,14 @@ class SpShelf:
                 if cmds.frameLayout(frame, exists=True):
                     if not visible:
                         cmds.frameLayout(frame, edit=True, collapse=False)
+                        self.ensure_shelf_built(shelf_index)
                     cmds.frameLayout(frame, edit=True, labelVisible=visible)
             
-            self.resize_window()
+            self.request_resize()
 
     def add_current_shelf(self):
         shelf = cmds.shelfTabLayout("ShelfLayout", query=True, selectTab=True)
-        shelf_file = os.path.join(cmds.internalVar(userShelfDir=True), f"shelf_{shelf}.mel")
+        shelf_file = os.path.join(self.user_shelf_dir, f"shelf_{shelf}.mel")
 
         if not os.path.exists(shelf_file):
             cmds.warning(f"Shelf file not found: {shelf_file}")
@@ -215,17 +1173,165 @@ class SpShelf:
         # New shelf defaults to valid settings or global default?
         # Let's default to global setting
         global_vis = self.settings.get("SHOW_FRAME_LABEL", True)
-        self.shelves.append({"name": shelf, "buttons": self.parse_shelf_file(shelf_file), "collapsed": False, "label_visible": global_vis})
-        self.save_user_data()
-        cmds.evalDeferred(lambda: self.show(reopen=True))
+        stamp, digest = self._source_fingerprint(shelf_file)
+        new_shelf = {"id": os.urandom(6).hex(), "name": shelf, "buttons": self.parse_shelf_file(shelf_file),
+                     "collapsed": False, "label_visible": global_vis,
+                     "source": shelf_file, "source_stamp": stamp, "source_hash": digest}
+        self.shelves.append(new_shelf)
+        self.warm_command_cache([new_shelf])
+        self.update_search_index()
+        self.report_missing_icons(new_shelf)
+        self.save_user_data(content=[new_shelf])
+        if self.is_window_current():
+            self.create_shelf_frame(len(self.shelves) - 1)
+            self.request_resize()
+        else:
+            cmds.evalDeferred(lambda: self.show(reopen=True))
+
+    def _read_shelf_file(self, path):
+        # Runs on an import worker thread: stat, read and hash the file once, no Maya calls
+        start = time.perf_counter()
+        result = {"path": path, "name": os.path.splitext(os.path.basename(path))[0], "data": None, "buttons": None, "error": None}
+        if result["name"].startswith("shelf_"):
+            result["name"] = result["name"][len("shelf_"):]
+        try:
+            stamp = os.stat(path)
+            with open(path, 'rb') as f:
+                result["data"] = f.read()
+            result["source_stamp"] = [stamp.st_mtime_ns, stamp.st_size]
+            result["source_hash"] = hashlib.sha1(result["data"]).hexdigest()
+        except OSError as e:
+            result["error"] = str(e)
+        result["seconds"] = time.perf_counter() - start
+        return result
+
+    def _parse_shelf_data(self, result):
+        # Parses the bytes read by _read_shelf_file, on the main thread
+        start = time.perf_counter()
+        text = result.pop("data").decode('utf-8', errors='replace')
+        try:
+            # Same newlines as reading the file in text mode (parse_shelf_file)
+            result["buttons"] = _parse_shelf_text(text.replace("\r\n", "\n").replace("\r", "\n"))
+        except Exception as e:
+            result["error"] = str(e)
+        result["seconds"] += time.perf_counter() - start
+
+    @_timed("import_shelves")
+    def import_shelves(self, paths=None):
+        """
+        Imports several shelf files at once, by default every shelf_*.mel in the user shelf folder.
+        Files are read on a thread pool and parsed in turn, a shelf that is already stored under the
+        same name gets its buttons replaced. Everything is saved once and the open window is updated
+        once at the end. Returns one report dict per file (path, name, buttons, seconds, status, error).
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        if paths is None:
+            try:
+                names = sorted(n for n in os.listdir(self.user_shelf_dir) if n.startswith("shelf_") and n.endswith(".mel"))
+            except OSError:
+                names = []
+            paths = [os.path.join(self.user_shelf_dir, n) for n in names]
+        if not paths:
+            cmds.warning("No shelf files to import.")
+            return []
+
+        start = time.perf_counter()
+        # Only the file reads and hashing run on threads, they release the GIL (helps with shelves on
+        # network shares). The parser is pure Python and holds the GIL, parsing on several threads
+        # is no faster and only adds contention, so it runs here. A process pool would start new
+        # interpreters from the Maya executable, which is not safe inside Maya.
+        with ThreadPoolExecutor(max_workers=min(self.IMPORT_WORKERS, len(paths))) as pool:
+            results = list(pool.map(self._read_shelf_file, paths))
+        for result in results:
+            if result["error"] is None:
+                self._parse_shelf_data(result)
+        parse_seconds = time.perf_counter() - start
+
+        self.load_user_data() # Refresh data
+        global_vis = self.settings.get("SHOW_FRAME_LABEL", True)
+        existing = {shelf["name"]: shelf for shelf in self.shelves}
+        imported = set()
+        changed = []
+        new_indices = []
+        for result in results:
+            if result["error"] is not None:
+                result["status"] = "error"
+                continue
+            name = result["name"]
+            if name in imported:
+                # Same shelf name twice in one import, the first file wins
+                result["status"] = "duplicate"
+                continue
+            imported.add(name)
+            source = {"source": result["path"], "source_stamp": result["source_stamp"], "source_hash": result["source_hash"]}
+            shelf = existing.get(name)
+            if shelf is not None:
+                shelf["buttons"] = result["buttons"]
+                shelf.update(source)
+                result["status"] = "replaced"
+            else:
+                shelf = {"id": os.urandom(6).hex(), "name": name, "buttons": result["buttons"],
+                         "collapsed": False, "label_visible": global_vis}
+                shelf.update(source)
+                self.shelves.append(shelf)
+                new_indices.append(len(self.shelves) - 1)
+                result["status"] = "added"
+            changed.append(shelf)
+
+        if changed:
+            self.warm_command_cache()
+            self.update_search_index()
+            for shelf in changed:
+                self.report_missing_icons(shelf)
+            # One save for the whole batch
+            self.save_user_data(content=changed)
+            if self.is_window_current():
+                changed_ids = {shelf["id"] for shelf in changed}
+                with self.suspend_updates():
+                    for shelf_idx, shelf in enumerate(self.shelves):
+                        if shelf["id"] in changed_ids and shelf_idx not in new_indices:
+                            self.refresh_shelf_ui(shelf_idx)
+                    for shelf_idx in new_indices:
+                        self.create_shelf_frame(shelf_idx)
+                self.request_resize()
+            elif cmds.window(self.WINDOW_NAME, exists=True):
+                cmds.evalDeferred(lambda: self.show(reopen=True))
+
+        # Per file report
+        report = []
+        for result in results:
+            entry = {"path": result["path"], "name": result["name"], "status": result["status"],
+                     "buttons": len(result["buttons"] or []), "seconds": result["seconds"], "error": result["error"]}
+            report.append(entry)
+            print(f"spShelf import: {os.path.basename(entry['path'])}: {entry['status']}, "
+                  f"{entry['buttons']} items, {entry['seconds'] * 1000:.1f} ms")
+            if entry["error"] is not None:
+                cmds.warning(f"Failed to import shelf file {entry['path']}: {entry['error']}")
+        counts = collections.Counter(entry["status"] for entry in report)
+        print(f"spShelf import: {counts['added']} added, {counts['replaced']} replaced, {counts['duplicate']} duplicate, "
+              f"{counts['error']} failed; parsed {len(report)} files in {parse_seconds * 1000:.1f} ms, "
+              f"total {(time.perf_counter() - start) * 1000:.1f} ms")
+        return report
+
+    def import_shelves_dialog(self):
+        # Multi-file picker starting in the user shelf folder, select all files to import everything
+        paths = cmds.fileDialog2(fileMode=4, dialogStyle=2, caption="Import Shelves", okCaption="Import",
+                                 startingDirectory=self.user_shelf_dir, fileFilter="Shelf Files (shelf_*.mel);;MEL Files (*.mel)")
+        if paths:
+            self.import_shelves(paths)
 
     def delete_button(self, shelf_idx, button_idx):
         if 0 <= shelf_idx < len(self.shelves):
             shelf = self.shelves[shelf_idx]
             if 0 <= button_idx < len(shelf["buttons"]):
-                del shelf["buttons"][button_idx]
-                self.save_user_data()
-                cmds.evalDeferred(lambda: self.show(reopen=True))
+                # Replace the list rather than editing it, caches compare button lists by identity
+                shelf["buttons"] = shelf["buttons"][:button_idx] + shelf["buttons"][button_idx + 1:]
+                self.save_user_data(content=[shelf])
+                self.warm_command_cache()
+                self.update_search_index()
+                # Other callbacks resolve their button at click time, only this shelf needs redrawing
+                cmds.evalDeferred(lambda: (self.refresh_shelf_ui(shelf_idx), self.request_resize()))
                 cmds.warning(f"Button deleted from shelf '{shelf['name']}'.")
             else:
                 cmds.warning("Button index out of range.")
@@ -246,27 +1352,163 @@ class SpShelf:
         else:
             cmds.warning("Button deletion canceled.")
 
-    def display_shelf_buttons(self, shelf_idx, parent_layout):
-        shelf = self.shelves[shelf_idx]
+    def ensure_shelf_built(self, shelf_idx):
+        # Collapsed shelves start as empty frames, their buttons are built on first expand and kept
+        if shelf_idx >= len(self.shelf_contents) or self.shelf_contents[shelf_idx] is not None:
+            return
+        frame = self.shelf_frames[shelf_idx]
+        if cmds.frameLayout(frame, exists=True):
+            self.shelf_contents[shelf_idx] = self.display_shelf_buttons(shelf_idx, frame)
+
+    @_timed("rebuild_shelf")
+    def refresh_shelf_ui(self, shelf_idx):
+        # Re-draws the buttons of one shelf inside its existing frame
+        if not cmds.window(self.WINDOW_NAME, exists=True) or shelf_idx >= len(self.shelf_frames):
+            return
+        frame = self.shelf_frames[shelf_idx]
+        content = self.shelf_contents[shelf_idx]
+        if content is None or not cmds.frameLayout(frame, exists=True):
+            # Not built yet, it picks up the new buttons when expanded
+            return
+        if cmds.columnLayout(content, exists=True):
+            cmds.deleteUI(content, layout=True)
+        self.unregister_shelf_buttons(self.shelves[shelf_idx])
+        self.shelf_contents[shelf_idx] = self.display_shelf_buttons(shelf_idx, frame)
+
+    def register_button(self, shelf, button):
+        self._next_button_id += 1
+        self._button_registry[self._next_button_id] = (shelf, button)
+        return self._next_button_id
+
+    def unregister_shelf_buttons(self, shelf):
+        self._button_registry = {k: v for k, v in self._button_registry.items() if v[0] is not shelf}
+
+    def locate_button(self, button_id):
+        # Current (shelf_idx, button_idx) of a registered button, or None if it is gone
+        entry = self._button_registry.get(button_id)
+        if entry is None:
+            return None
+        shelf, button = entry
+        for shelf_idx, s in enumerate(self.shelves):
+            if s is shelf:
+                for button_idx, b in enumerate(shelf["buttons"]):
+                    if b is button:
+                        return shelf_idx, button_idx
+        return None
+
+    def dispatch(self, button_id, action, *args):
+        # Single entry point for every button, separator and menu item callback
+        entry = self._button_registry.get(button_id)
+        if entry is None:
+            return
+        shelf, b = entry
+        source_type = b.get("sourceType", "mel")
+        if action in ("command", "doubleClickCommand"):
+            self.execute_command(b.get(action, ""), source_type,
+                                 self.button_stats_name(shelf["name"], b, action) if _stats.enabled else None)
+        elif action == "menuItem":
+            item = b.get("menuItems", [])[args[0]]
+            # Older data has no per-item type, those ran with the button's type
+            self.execute_command(item.get("command", ""), item.get("sourceType", source_type),
+                                 self.button_stats_name(shelf["name"], b, item.get("label", "menu item")) if _stats.enabled else None)
+        elif action == "menu":
+            self.build_context_menu(args[0], button_id)
+        elif action == "delete":
+            location = self.locate_button(button_id)
+            if location:
+                self.confirm_and_delete_button(*location)
+
+    def dispatch_repeatable(self, button_id, action):
+        # Qt buttons don't get commandRepeatable from Maya, register them with Repeat Last (G) here.
+        # The command itself is remembered, so repeating still works after the window was rebuilt.
+        entry = self._button_registry.get(button_id)
+        if entry is not None and entry[1].get(action, "").strip():
+            b = entry[1]
+            self._repeat_command = (b[action], b.get("sourceType", "mel"))
+            cmds.repeatLast(addCommand='python("import spShelf; spShelf._repeat_last_command()")',
+                            addCommandLabel=b.get("label") or b.get("imageOverlayLabel") or "spShelf button")
+        self.dispatch(button_id, action)
+
+    def repeat_last_command(self):
+        if self._repeat_command is not None:
+            self.execute_command(*self._repeat_command)
+
+    def attach_context_menu(self, control, button_id):
+        # Only an empty popupMenu is created here, its items are built the first time it opens
+        popup = cmds.popupMenu(parent=control, button=3)
+        cmds.popupMenu(popup, edit=True, postMenuCommandOnce=True,
+                       postMenuCommand=partial(self.dispatch, button_id, "menu", popup))
+        return popup
+
+    def build_context_menu(self, popup, button_id):
+        b = self._button_registry[button_id][1]
+        if b.get("type") == "separator":
+            cmds.menuItem(label="Delete Separator", parent=popup,
+                          command=partial(self.dispatch, button_id, "delete"))
+            return
+
+        for item_index, item in enumerate(b.get("menuItems", [])):
+            cmds.menuItem(label=item.get("label", "Unnamed"), parent=popup,
+                          command=partial(self.dispatch, button_id, "menuItem", item_index))
+
+        cmds.menuItem(divider=True, parent=popup)
+        cmds.menuItem(label="Delete Button", parent=popup,
+                      command=partial(self.dispatch, button_id, "delete"))
+
+    def shelf_rows(self, shelf):
+        # Splits the shelf into rows of COLUMN_COUNT buttons (separators don't count towards the limit).
+        # Cached per shelf until its button list is replaced or the relevant settings change.
+        # Button lists are never edited in place, so holding on to the list is enough to detect that.
+        buttons = shelf["buttons"]
         col_count = self.settings["COLUMN_COUNT"]
         show_separators = self.settings.get("SHOW_SEPARATORS", True)
+        cached = self._row_cache.get(shelf.get("id"))
+        if cached and cached[0] is buttons and cached[1] == (col_count, show_separators):
+            return cached[2]
+
+        rows = []
+        current_row_items = []
+        button_count_in_row = 0
+        for b in buttons:
+            if b.get("type") == "separator":
+                if show_separators:
+                    current_row_items.append(b)
+            else:
+                current_row_items.append(b)
+                button_count_in_row += 1
+            
+            if button_count_in_row >= col_count:
+                rows.append(current_row_items)
+                current_row_items = []
+                button_count_in_row = 0
+        
+        # Keep the last row if any
+        if current_row_items:
+            rows.append(current_row_items)
+        self._row_cache[shelf.get("id")] = (buttons, (col_count, show_separators), rows)
+        return rows
+
+    @_timed("display_shelf_buttons")
+    def display_shelf_buttons(self, shelf_idx, parent_layout):
+        if self.settings.get("QT_BUTTON_GRID", False) and _import_qt() is not None:
+            content = self.display_shelf_buttons_qt(shelf_idx, parent_layout)
+            if content:
+                return content
+        shelf = self.shelves[shelf_idx]
         horizontal_separators = self.settings.get("HORIZONTAL_SEPARATORS", False)
         dotted_separators = self.settings.get("DOTTED_SEPARATORS", False)
         
         # Main container for the shelf content
         shelf_content_layout = cmds.columnLayout(adjustableColumn=True, parent=parent_layout)
         
-        # Initialize the first row
-        current_row_items = []
-        button_count_in_row = 0
-        
         def commit_row(items):
             if not items:
                 return
             # Create a rowLayout for the collected items
             row = cmds.rowLayout(numberOfColumns=len(items), parent=shelf_content_layout)
-            for item_data in items:
-                if item_data["type"] == "separator":
+            for b in items:
+                button_id = self.register_button(shelf, b)
+                if b.get("type") == "separator":
                     # Determine dimensions based on orientation
                     sep_ctrl = None
                     if dotted_separators:
@@ -281,67 +1523,107 @@ class SpShelf:
                             sep_ctrl = cmds.separator(style="shelf", parent=row, height=40, width=8, horizontal=False)
                     
                     if sep_ctrl:
-                        sep_idx = item_data["index"]
-                        sep_popup = cmds.popupMenu(parent=sep_ctrl, button=3)
-                        cmds.menuItem(label="Delete Separator", parent=sep_popup,
-                                      command=lambda _, s_idx=shelf_idx, b_idx=sep_idx: self.confirm_and_delete_button(s_idx, b_idx))
+                        self.attach_context_menu(sep_ctrl, button_id)
                 else:
-                    b = item_data["data"]
-                    btn_idx = item_data["index"]
-                    
                     label = b.get("imageOverlayLabel", "")
-                    icon = b.get("image", "commandButton.png")
+                    icon = _icon_cache.image(b.get("image", _icon_cache.DEFAULT_ICON))
                     annotation = b.get("annotation", "")
-                    command = b.get("command", "")
-                    source_type = b.get("sourceType", "mel")
-                    double_click_command = b.get("doubleClickCommand", "")
 
                     # Create button
                     btn = cmds.iconTextButton(commandRepeatable=True, width=40, height=40,
                         imageOverlayLabel=label, image1=icon, parent=row,
                         annotation=annotation,
-                        command=lambda c=command, t=source_type: self.execute_command(c, t),
-                        doubleClickCommand=lambda c=double_click_command, t=source_type: self.execute_command(c, t)
+                        command=partial(self.dispatch, button_id, "command"),
+                        doubleClickCommand=partial(self.dispatch, button_id, "doubleClickCommand")
                     )
 
                     # Context menu
-                    popup = cmds.popupMenu(parent=btn, button=3)
-                    for item in b.get("menuItems", []):
-                        item_label = item.get("label", "Unnamed")
-                        item_command = item.get("command", "")
-                        cmds.menuItem(
-                            label=item_label, parent=popup,
-                            command=lambda _, c=item_command, t=source_type: self.execute_command(c, t)
-                        )
-
-                    cmds.menuItem(divider=True, parent=popup)
-                    cmds.menuItem(
-                        label="Delete Button", parent=popup,
-                        command=lambda _, s_idx=shelf_idx, b_idx=btn_idx: self.confirm_and_delete_button(s_idx, b_idx)
-                    )
+                    self.attach_context_menu(btn, button_id)
 
-        for button_index, b in enumerate(shelf["buttons"]):
-            is_separator = b.get("type") == "separator"
-            
-            if is_separator:
-                if show_separators:
-                    current_row_items.append({"type": "separator", "index": button_index})
+        for row_items in self.shelf_rows(shelf):
+            commit_row(row_items)
+        return shelf_content_layout
+
+    def display_shelf_buttons_qt(self, shelf_idx, parent_layout):
+        # Renders the whole shelf as one Qt widget parented into a columnLayout, instead of one
+        # maya.cmds call per row/button. Returns None if the layout can't be wrapped (cmds fallback).
+        qt = _import_qt()
+        shelf = self.shelves[shelf_idx]
+        horizontal_separators = self.settings.get("HORIZONTAL_SEPARATORS", False)
+        dotted_separators = self.settings.get("DOTTED_SEPARATORS", False)
+
+        shelf_content_layout = cmds.columnLayout(adjustableColumn=True, parent=parent_layout)
+        ptr = qt.omui.MQtUtil.findControl(shelf_content_layout)
+        if ptr is None:
+            cmds.deleteUI(shelf_content_layout, layout=True)
+            return None
+        container = qt.wrapInstance(int(ptr), qt.QWidget)
+
+        grid_widget = qt.QWidget(container)
+        grid = qt.QVBoxLayout(grid_widget)
+        grid.setContentsMargins(0, 0, 0, 0)
+        grid.setSpacing(0)
+        for row_items in self.shelf_rows(shelf):
+            row = qt.QHBoxLayout()
+            row.setContentsMargins(0, 0, 0, 0)
+            row.setSpacing(0)
+            for b in row_items:
+                button_id = self.register_button(shelf, b)
+                if b.get("type") == "separator":
+                    if dotted_separators:
+                        widget = qt.QLabel(" . . . . " if horizontal_separators else ".\n.\n.\n.", grid_widget)
+                        widget.setAlignment(qt.Qt.AlignCenter)
+                    else:
+                        widget = qt.QFrame(grid_widget)
+                        widget.setFrameShape(qt.QFrame.HLine if horizontal_separators else qt.QFrame.VLine)
+                        widget.setFrameShadow(qt.QFrame.Sunken)
+                    if horizontal_separators:
+                        widget.setFixedSize(40, 10)
+                    else:
+                        widget.setFixedSize(8, 40)
+                else:
+                    widget = qt.ShelfToolButton(b.get("imageOverlayLabel", ""), grid_widget)
+                    widget.setFixedSize(40, 40)
+                    widget.setIconSize(qt.QSize(32, 32))
+                    widget.setAutoRaise(True)
+                    widget.setIcon(_icon_cache.qicon(b.get("image", _icon_cache.DEFAULT_ICON)))
+                    widget.setToolTip(b.get("annotation", ""))
+                    widget.clicked.connect(partial(self.dispatch_repeatable, button_id, "command"))
+                    if b.get("doubleClickCommand"):
+                        # Without one, a double-click stays two plain clicks
+                        widget.double_click_callback = partial(self.dispatch_repeatable, button_id, "doubleClickCommand")
+                widget.setContextMenuPolicy(qt.Qt.CustomContextMenu)
+                widget.customContextMenuRequested.connect(partial(self.show_qt_context_menu, widget, button_id))
+                row.addWidget(widget)
+            row.addStretch()
+            grid.addLayout(row)
+
+        container_layout = container.layout() or qt.QVBoxLayout(container)
+        container_layout.addWidget(grid_widget)
+        return shelf_content_layout
+
+    def show_qt_context_menu(self, widget, button_id, pos):
+        # Same lazy behaviour as the cmds popups: the menu is built on first use and kept on the widget
+        menu = getattr(widget, "context_menu", None)
+        if menu is None:
+            menu = _import_qt().QMenu(widget)
+            b = self._button_registry[button_id][1]
+            if b.get("type") == "separator":
+                menu.addAction("Delete Separator").triggered.connect(partial(self.dispatch, button_id, "delete"))
             else:
-                current_row_items.append({"type": "button", "data": b, "index": button_index})
-                button_count_in_row += 1
-            
-            # If we reached the button limit (separators don't count towards the limit)
-            if button_count_in_row >= col_count:
-                commit_row(current_row_items)
-                current_row_items = []
-                button_count_in_row = 0
-        
-        # Commit the last row if any
-        commit_row(current_row_items)
+                for item_index, item in enumerate(b.get("menuItems", [])):
+                    menu.addAction(item.get("label", "Unnamed")).triggered.connect(
+                        partial(self.dispatch, button_id, "menuItem", item_index))
+                menu.addSeparator()
+                menu.addAction("Delete Button").triggered.connect(partial(self.dispatch, button_id, "delete"))
+            widget.context_menu = menu
+        menu.popup(widget.mapToGlobal(pos))
 
     def save_settings_ui(self, *args):
+        previous = dict(self.settings)
         self.settings["COLUMN_COUNT"] = cmds.intField(self.column_input, query=True, value=True)
         self.settings["SCREEN_HEIGHT"] = cmds.intField(self.screen_height_input, query=True, value=True)
+        self.settings["CLOSE_DELAY_MS"] = cmds.intField(self.close_delay_input, query=True, value=True)
         self.settings["CLOSE_ON_REPEAT_FLAG"] = cmds.checkBox(self.close_on_repeat_toggle, query=True, value=True)
         self.settings["SHOW_WINDOW_UNDER_CURSOR"] = cmds.checkBox(self.show_window_under_cursor_toggle, query=True, value=True)
         self.settings["SHOW_FRAME_LABEL"] = cmds.checkBox(self.show_frame_label_toggle, query=True, value=True)
@@ -349,9 +1631,23 @@ class SpShelf:
         self.settings["SHOW_SEPARATORS"] = cmds.checkBox(self.show_separators_toggle, query=True, value=True)
         self.settings["HORIZONTAL_SEPARATORS"] = cmds.checkBox(self.horizontal_separators_toggle, query=True, value=True)
         self.settings["DOTTED_SEPARATORS"] = cmds.checkBox(self.dotted_separators_toggle, query=True, value=True)
+        self.settings["RESIDENT_WINDOW"] = cmds.checkBox(self.resident_window_toggle, query=True, value=True)
+        self.settings["LIVE_SHELF_SYNC"] = cmds.checkBox(self.live_shelf_sync_toggle, query=True, value=True)
+        self.settings["LOG_COMMANDS"] = cmds.checkBox(self.log_commands_toggle, query=True, value=True)
+        self.settings["QT_BUTTON_GRID"] = cmds.checkBox(self.qt_button_grid_toggle, query=True, value=True)
+        self.settings["SHOW_SEARCH"] = cmds.checkBox(self.show_search_toggle, query=True, value=True)
         
         self.save_user_data()
-        cmds.evalDeferred(lambda: self.show(reopen=True))
+
+        changed = {k for k, v in self.settings.items() if previous.get(k) != v}
+        if changed & set(self.REBUILD_SETTINGS) or not self.is_window_current():
+            cmds.evalDeferred(lambda: self.show(reopen=True))
+        elif changed & set(self.REFLOW_SETTINGS):
+            # Only the shelf rows depend on these, re-flow every built shelf in place
+            with self.suspend_updates():
+                for shelf_idx in range(len(self.shelves)):
+                    self.refresh_shelf_ui(shelf_idx)
+            self.request_resize()
 
     def delete_all_shelves(self):
         confirm = cmds.confirmDialog(
@@ -364,29 +1660,93 @@ class SpShelf:
         )
         if confirm == "Yes":
             self.shelves = []
+            self._row_cache = {}
             # We save settings too effectively as we usually save everything together
             self.save_user_data()
+            self.warm_command_cache()
+            self.update_search_index()
             cmds.warning("All shelves have been deleted.")
-            cmds.evalDeferred(lambda: self.show(reopen=True))
+            # Remove the shelf frames only, the settings part of the window stays as is
+            with self.suspend_updates():
+                for frame in self.shelf_frames:
+                    if cmds.frameLayout(frame, exists=True):
+                        cmds.deleteUI(frame, layout=True)
+            self.shelf_frames = []
+            self.shelf_contents = []
+            self._button_registry = {}
+            self.request_resize()
         else:
             cmds.warning("Deletion canceled.")
 
+    def is_window_current(self):
+        # True if the window exists and reflects the loaded data, so it can be patched in place
+        return cmds.window(self.WINDOW_NAME, exists=True) and self._window_revision == self._revision
+
+    def is_window_visible(self):
+        if not cmds.window(self.WINDOW_NAME, exists=True):
+            return False
+        return cmds.window(self.WINDOW_NAME, query=True, visible=True)
+
+    @_timed("hide")
+    def close_window(self):
+        # Resident mode keeps the built window around and only hides it
+        self._reposition_at = None
+        if not cmds.window(self.WINDOW_NAME, exists=True):
+            return
+        if self.settings.get("RESIDENT_WINDOW", False):
+            cmds.window(self.WINDOW_NAME, edit=True, visible=False)
+        else:
+            cmds.deleteUI(self.WINDOW_NAME, window=True)
+
+    def call_later(self, delay_ms, fn):
+        # Non-blocking timer: Qt single-shot if available, otherwise chained idle evalDeferred calls
+        qt = _import_qt()
+        if qt is not None:
+            qt.QTimer.singleShot(delay_ms, fn)
+            return
+        deadline = time.monotonic() + delay_ms / 1000.0
+        def tick():
+            if time.monotonic() >= deadline:
+                fn()
+            else:
+                cmds.evalDeferred(tick, lowestPriority=True)
+        cmds.evalDeferred(tick, lowestPriority=True)
+
+    def schedule_close(self):
+        # Key release: close after a short delay, unless the key is pressed again meanwhile
+        # (OS key auto-repeat sends release/press pairs while the key is held)
+        self._close_token += 1
+        token = self._close_token
+        delay = max(0, int(self.settings.get("CLOSE_DELAY_MS", 200)))
+        self.call_later(delay, lambda: self._close_if_current(token))
+
+    def _close_if_current(self, token):
+        if token == self._close_token:
+            self.close_window()
+
     def show(self, close_on_repeat=False, reopen=False):
+        if close_on_repeat:
+            self._on_release()
+        else:
+            self._on_press(reopen)
+
+    @_timed("release")
+    def _on_release(self):
+        if self.settings["CLOSE_ON_REPEAT_FLAG"]:
+            if cmds.window(self.WINDOW_NAME, exists=True):
+                self.schedule_close()
+
+    @_timed("show")
+    def _on_press(self, reopen=False):
+        # Key press: cancel a close scheduled by a previous release
+        self._close_token += 1
+
         self.load_user_data() # Ensure fresh data
         
         if reopen:
             if cmds.window(self.WINDOW_NAME, exists=True):
                 cmds.deleteUI(self.WINDOW_NAME, window=True)
 
-        if close_on_repeat:
-            if self.settings["CLOSE_ON_REPEAT_FLAG"]:
-                if cmds.window(self.WINDOW_NAME, exists=True):
-                    time.sleep(0.2)
-                    cmds.evalDeferred(lambda: cmds.deleteUI(self.WINDOW_NAME, window=True))
-                return
-            else:
-                return
-
         # If not close_on_repeat but flag is false, check logic from original:
         # if CLOSE_ON_REPEAT_FLAG == False: close window if exists?
         # Original: if CLOSE_ON_REPEAT_FLAG == False : if cmds.window(sp_shelf_window, exists=True): cmds.deleteUI...
@@ -399,11 +1759,13 @@ class SpShelf:
         # if close_on_repeat: return (Implicit else)
         # if CLOSE_ON_REPEAT_FLAG == False: if window exists, delete it and return (Toggle behavior)
         
-        if not close_on_repeat:
-            if not self.settings["CLOSE_ON_REPEAT_FLAG"]:
-                if cmds.window(self.WINDOW_NAME, exists=True):
-                    cmds.deleteUI(self.WINDOW_NAME, window=True)
-                    return
+        if not self.settings["CLOSE_ON_REPEAT_FLAG"]:
+            if self.is_window_visible():
+                self.close_window()
+                return
+
+        # Pick up edits made to the source shelf files since the last press
+        self.sync_shelves()
 
         # Ensure we do not use saved Maya preferences for this window
         if cmds.windowPref(self.WINDOW_NAME, exists=True):
@@ -411,44 +1773,112 @@ class SpShelf:
 
         # Create Window
         if cmds.window(self.WINDOW_NAME, exists=True):
-            # If it exists (e.g. hold mode), just show it
-            cmds.showWindow(self.WINDOW_NAME)
-        else:
-            self.create_window()
+            if self.is_window_visible():
+                # If it is already up (e.g. hold mode key repeat), just show it
+                cmds.showWindow(self.WINDOW_NAME)
+                return
+            if self.settings.get("RESIDENT_WINDOW", False) and self._window_revision == self._revision:
+                # Resident window is still up to date, only move it under the cursor
+                self.position_window()
+                with _stats.phase("showWindow"):
+                    cmds.showWindow(self.WINDOW_NAME)
+                return
+            # Stale or non-resident leftover, rebuild from scratch
+            cmds.deleteUI(self.WINDOW_NAME, window=True)
+
+        self.create_window()
             
-    def create_window(self):
-        # retain=False prevents Maya from keeping the window in memory/hidden state after close
+    def create_shelf_frame(self, i):
+        shelf = self.shelves[i]
+        frame_lbl = shelf['name'] # Always set the label text, visibility controls display
+        # Make sure labelVisible is correctly handled
+        # Default to global setting if not present in individual
+        global_vis = self.settings.get("SHOW_FRAME_LABEL", True)
+        label_visible = shelf.get("label_visible", global_vis)
+        
+        is_collapsed = shelf.get("collapsed", False)
+        
+        shelf_frame = cmds.frameLayout(label=frame_lbl, collapsable=True, collapse=is_collapsed, 
+                                       parent=self.shelves_layout, marginWidth=0, marginHeight=0, 
+                                       labelVisible=label_visible,
+                                       collapseCommand=lambda idx=i: self.on_shelf_collapse(idx, True),
+                                       expandCommand=lambda idx=i: self.on_shelf_collapse(idx, False))
+        
+        # Popup menu for controlling label visibility
+        popup = cmds.popupMenu(parent=shelf_frame)
+        cmds.menuItem(label="Show/Hide Label", parent=popup, 
+                      command=lambda _, idx=i: self.toggle_single_shelf_label(idx, not self.shelves[idx].get("label_visible", True)))
+
+        self.shelf_frames.append(shelf_frame)
+        # Collapsed shelves stay empty placeholders until expanded
+        self.shelf_contents.append(None if is_collapsed else self.display_shelf_buttons(i, shelf_frame))
+
+    @_timed("prewarm")
+    def prewarm(self, build_window=False):
+        """
+        Does the work of a cold first press ahead of time: loads the store, picks up source
+        shelf changes, compiles commands, resolves icons, plans the rows and, with the search
+        field on, builds its index. With build_window and resident mode on, the window is
+        also built hidden.
+        """
+        self.load_user_data()
+        self.sync_shelves(force=True)
+        self.warm_command_cache()
+        if self.settings.get("SHOW_SEARCH", False):
+            self.update_search_index(build=True)
+        for shelf in self.shelves:
+            self.shelf_rows(shelf)
+            for b in shelf.get("buttons", []):
+                if b.get("type") != "separator":
+                    _icon_cache.resolve(b.get("image", _icon_cache.DEFAULT_ICON))
+        if build_window and self.settings.get("RESIDENT_WINDOW", False) and not cmds.window(self.WINDOW_NAME, exists=True):
+            self.create_window(show=False)
+
+    @_timed("create_window")
+    def create_window(self, show=True):
+        # retain=False prevents Maya from keeping the window in memory/hidden state after close,
+        # resident mode retains it so closing only hides the pre-built window
+        resident = self.settings.get("RESIDENT_WINDOW", False)
+        self._search_hits = []
+        # Created at the measured size of this layout if known, then no fit pass is needed
+        size = self.cached_window_size()
+        width, height = size or (self.window_data['width'], self.window_data['height'])
         cmds.window(self.WINDOW_NAME, title="spShelf", sizeable=True, minimizeButton=False, maximizeButton=False,
-                    height=self.window_data['height'], width=self.window_data['width'], 
-                    toolbox=self.settings["TOOLBOX_WINDOW_STYLE"], retain=False)
+                    height=height, width=width, 
+                    toolbox=self.settings["TOOLBOX_WINDOW_STYLE"], retain=resident)
+        self._window_revision = self._revision
 
         main_layout = cmds.columnLayout(adjustableColumn=True, parent=self.WINDOW_NAME)
 
+        # Quick search over all shelves, with a fixed set of result buttons shown as needed
+        self.search_field = None
+        self.search_result_buttons = []
+        if self.settings.get("SHOW_SEARCH", False):
+            self.search_field = cmds.textField(placeholderText="Search...", parent=main_layout,
+                                               textChangedCommand=self.on_search_changed,
+                                               enterCommand=self.on_search_enter, alwaysInvokeEnterCommandOnReturn=True)
+            for n in range(self.SEARCH_RESULT_COUNT):
+                self.search_result_buttons.append(cmds.iconTextButton(style="iconAndTextHorizontal", height=24, visible=False,
+                                                                      parent=main_layout, command=partial(self.run_search_hit, n)))
+            # Only focused when clicked, so activating the window doesn't route the hotkey into the field
+            qt = _import_qt()
+            ptr = qt.omui.MQtUtil.findControl(self.search_field) if qt is not None else None
+            if ptr:
+                qt.wrapInstance(int(ptr), qt.QWidget).setFocusPolicy(qt.Qt.ClickFocus)
+            if not self._search_index.built and not self._search_index_pending:
+                self._search_index_pending = True
+                cmds.evalDeferred(self.build_search_index_idle, lowestPriority=True)
+
+        # Shelf frames get their own container so shelves added later stay above the settings
+        self.shelves_layout = cmds.columnLayout(adjustableColumn=True, parent=main_layout)
+
         self.shelf_frames = []
+        self.shelf_contents = []
+        self._button_registry = {}
 
         # Draw Shelves
-        for i, shelf in enumerate(self.shelves):
-            frame_lbl = shelf['name'] # Always set the label text, visibility controls display
-            # Make sure labelVisible is correctly handled
-            # Default to global setting if not present in individual
-            global_vis = self.settings.get("SHOW_FRAME_LABEL", True)
-            label_visible = shelf.get("label_visible", global_vis)
-            
-            is_collapsed = shelf.get("collapsed", False)
-            
-            shelf_frame = cmds.frameLayout(label=frame_lbl, collapsable=True, collapse=is_collapsed, 
-                                           parent=main_layout, marginWidth=0, marginHeight=0, 
-                                           labelVisible=label_visible,
-                                           collapseCommand=lambda idx=i: self.on_shelf_collapse(idx, True),
-                                           expandCommand=lambda idx=i: self.on_shelf_collapse(idx, False))
-            
-            # Popup menu for controlling label visibility
-            popup = cmds.popupMenu(parent=shelf_frame)
-            cmds.menuItem(label="Show/Hide Label", parent=popup, 
-                          command=lambda _, idx=i: self.toggle_single_shelf_label(idx, not self.shelves[idx].get("label_visible", True)))
-
-            self.shelf_frames.append(shelf_frame)
-            self.display_shelf_buttons(i, shelf_frame)
+        for i in range(len(self.shelves)):
+            self.create_shelf_frame(i)
 
         # Settings Frame
         # Default state handling for older json
@@ -466,6 +1896,8 @@ class SpShelf:
 
         cmds.button(backgroundColor=(0, 0.5, 0.4), height=30, label="Add Current Shelf", 
                     command=lambda _: self.add_current_shelf(), parent=settings_frame)
+        cmds.button(backgroundColor=(0, 0.4, 0.35), height=24, label="Import Shelves...",
+                    command=lambda _: self.import_shelves_dialog(), parent=settings_frame)
 
         # Settings Fields
         settings_layout = cmds.rowLayout(numberOfColumns=2, adjustableColumn=2, columnAlign2=("left", "left"), parent=settings_frame)
@@ -476,6 +1908,10 @@ class SpShelf:
         self.screen_height_input = cmds.intField(width=40, value=self.settings["SCREEN_HEIGHT"], parent=settings_layout_2)
         cmds.text(label="Screen Height", parent=settings_layout_2, align="left")
 
+        settings_layout_3 = cmds.rowLayout(numberOfColumns=2, adjustableColumn=2, columnAlign2=("right", "left"), parent=settings_frame)
+        self.close_delay_input = cmds.intField(width=40, minValue=0, value=self.settings.get("CLOSE_DELAY_MS", 200), parent=settings_layout_3)
+        cmds.text(label="Close Delay (ms)", parent=settings_layout_3, align="left")
+
         # Checkboxes
         toggle_layout = cmds.columnLayout(adjustableColumn=True, parent=settings_frame)
         self.close_on_repeat_toggle = cmds.checkBox(value=self.settings["CLOSE_ON_REPEAT_FLAG"], parent=toggle_layout, label="Close on Key Release")
@@ -489,6 +1925,11 @@ class SpShelf:
         self.show_separators_toggle = cmds.checkBox(value=self.settings.get("SHOW_SEPARATORS", True), parent=toggle_layout, label="Show Separators")
         self.horizontal_separators_toggle = cmds.checkBox(value=self.settings.get("HORIZONTAL_SEPARATORS", False), parent=toggle_layout, label="Horizontal Separators")
         self.dotted_separators_toggle = cmds.checkBox(value=self.settings.get("DOTTED_SEPARATORS", False), parent=toggle_layout, label="Dotted Style")
+        self.resident_window_toggle = cmds.checkBox(value=self.settings.get("RESIDENT_WINDOW", False), parent=toggle_layout, label="Keep Window Resident")
+        self.live_shelf_sync_toggle = cmds.checkBox(value=self.settings.get("LIVE_SHELF_SYNC", True), parent=toggle_layout, label="Sync with Source Shelves")
+        self.log_commands_toggle = cmds.checkBox(value=self.settings.get("LOG_COMMANDS", True), parent=toggle_layout, label="Log Commands")
+        self.qt_button_grid_toggle = cmds.checkBox(value=self.settings.get("QT_BUTTON_GRID", False), parent=toggle_layout, label="Native Qt Buttons")
+        self.show_search_toggle = cmds.checkBox(value=self.settings.get("SHOW_SEARCH", False), parent=toggle_layout, label="Show Search Field")
 
         # Save Button
         cmds.button(backgroundColor=(0.2, 0.6, 0.8), height=30, label="Save Settings",
@@ -504,49 +1945,120 @@ class SpShelf:
                     command=lambda _: self.delete_all_shelves(), parent=delete_layout)
 
         # Force initial resize to respect collapsed states
-        self.resize_window()
+        if size is None:
+            self.resize_window()
+
+        if not show:
+            # Pre-built hidden (prewarm), the next press positions and shows it
+            return
 
         # Positioning
         self.position_window()
         
-        cmds.showWindow(self.WINDOW_NAME)
+        with _stats.phase("showWindow"):
+            cmds.showWindow(self.WINDOW_NAME)
 
-    def position_window(self):
-        if not self.settings["SHOW_WINDOW_UNDER_CURSOR"] or QCursor is None:
+    def screen_bounds(self, qt, pos):
+        # (left, top, right, bottom) of the available area of the monitor under the cursor.
+        # SCREEN_HEIGHT is only used when Qt reports no screen.
+        screen = qt.QGuiApplication.screenAt(pos) or qt.QGuiApplication.primaryScreen()
+        if screen is None:
+            return 0, 0, float("inf"), self.settings["SCREEN_HEIGHT"]
+        geometry = screen.availableGeometry()
+        return geometry.left(), geometry.top(), geometry.right() + 1, geometry.bottom() + 1
+
+    @_timed("position_window")
+    def position_window(self, cursor_pos=None):
+        if not self.settings["SHOW_WINDOW_UNDER_CURSOR"]:
+            return
+        qt = _import_qt()
+        if qt is None:
             return
 
-        x = QCursor.pos().x()
-        y = QCursor.pos().y()
+        if cursor_pos is None:
+            cursor_pos = qt.QCursor.pos()
+        x = cursor_pos.x()
+        y = cursor_pos.y()
 
-        # We need to show window first to get dimensions usually, or guess
-        # Maya's showWindow is async-ish, but let's try querying
-        # If window just created, might need evalDeferred for accurate size, or use stored size
-        window_width = self.window_data['width']
-        window_height = self.window_data['height']
-        
-        # Try to get actual size if valid
-        if cmds.window(self.WINDOW_NAME, exists=True):
-             # These queries might return 0 if not yet visible
-             w = cmds.window(self.WINDOW_NAME, query=True, width=True)
-             h = cmds.window(self.WINDOW_NAME, query=True, height=True)
-             if w > 10: window_width = w
-             if h > 10: window_height = h
-        
-        screen_height = self.settings["SCREEN_HEIGHT"]
-        
-        window_y = max(0, y - (window_height / 2))
-        window_x = max(0, x - (window_width / 2))
+        # Querying the window before it is shown returns stale values, use the size measured
+        # for this layout instead
+        size = self.cached_window_size()
+        self._reposition_at = None
+        if size is None:
+            # Not measured yet: place it with the last measured size for now and again once
+            # the fitted size is known
+            size = (self.window_data['width'], self.window_data['height'])
+            self._reposition_at = cursor_pos
+            cmds.evalDeferred(partial(self.remember_window_size, self.layout_signature()), lowestPriority=True)
+        window_width, window_height = size
+        left, top, right, bottom = self.screen_bounds(qt, cursor_pos)
 
-        if window_y > (screen_height - window_height):
-            window_y = screen_height - window_height
+        # Centered on the cursor, kept inside the monitor the cursor is on
+        window_x = max(left, min(x - (window_width / 2), right - window_width))
+        window_y = max(top, min(y - (window_height / 2), bottom - window_height))
             
         cmds.window(self.WINDOW_NAME, edit=True, tlc=(int(window_y), int(window_x)))
 
-# Global instance for backward compatibility and easy calls
-_shelf_instance = SpShelf()
+# Global instance for backward compatibility and easy calls.
+# Created on first use so `import spShelf` stays free of disk I/O and Maya queries.
+_shelf_instance = None
+
+def _get_shelf_instance():
+    global _shelf_instance
+    if _shelf_instance is None:
+        _shelf_instance = SpShelf()
+    return _shelf_instance
+
+def _repeat_last_command():
+    # Called by Maya's Repeat Last for clicks on native Qt buttons, see SpShelf.dispatch_repeatable
+    _get_shelf_instance().repeat_last_command()
+
+def sp_shelf_cache_stats():
+    """
+    Returns how often load_user_data was served from memory vs re-parsed from disk.
+    """
+    stats = dict(_get_shelf_instance().load_stats)
+    total = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = stats["hits"] / total if total else 0.0
+    return stats
+
+def sp_shelf_enable_stats(enabled=True):
+    """
+    Turns the phase timing instrumentation on or off (off by default).
+    """
+    _stats.enabled = enabled
+
+def sp_shelf_stats(reset=False, dump_path=None):
+    """
+    Returns the recorded phase timings as {phase: {count, p50_ms, p90_ms, p99_ms, max_ms}}
+    plus the data cache counters. Optionally writes them to `dump_path` as JSON.
+    """
+    stats = {"phases": _stats.summary(), "cache": sp_shelf_cache_stats()}
+    if dump_path:
+        with open(dump_path, 'w') as f:
+            json.dump(stats, f, indent=4)
+    if reset:
+        _stats.reset()
+    return stats
+
+def sp_shelf_prewarm(build_window=False, deferred=True):
+    """
+    Prepares spShelf while Maya is idle so the first hotkey press is as fast as the next ones.
+    Meant to be called from userSetup.py.
+    """
+    if deferred:
+        cmds.evalDeferred(lambda: _get_shelf_instance().prewarm(build_window=build_window), lowestPriority=True)
+    else:
+        _get_shelf_instance().prewarm(build_window=build_window)
+
+def sp_shelf_import(paths=None):
+    """
+    Bulk imports shelf files, by default every shelf_*.mel in the user shelf folder.
+    """
+    return _get_shelf_instance().import_shelves(paths)
 
 def sp_shelf_ui(close_on_repeat=False, reopen=False):
     """
     Main entry point for the script.
     """
-    _shelf_instance.show(close_on_repeat=close_on_repeat, reopen=reopen)
\ No newline at end of file
+    _get_shelf_instance().show(close_on_repeat=close_on_repeat, reopen=reopen)
\ No newline at end of file